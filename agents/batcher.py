@@ -0,0 +1,118 @@
+"""
+Request batching for Theo-AI agents.
+
+This module collects agent runs queued for the same model into small
+batches and dispatches each batch together, so bursts of /chat requests
+reach the model provider as one wave of parallel calls. Batches only take
+runs that are already queued; nothing waits for a batch to fill, since
+the provider APIs have no batch endpoint that would repay the delay.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Tuple
+
+from utils.logging_utils import setup_logger
+
+# Configure logging
+logger = setup_logger("batcher", "batcher.log")
+
+class LLMBatcher:
+    """
+    Batches agent runs per model key using one asyncio queue per key.
+    """
+
+    def __init__(self, max_batch: int = 16):
+        """
+        Initialize the batcher.
+
+        Args:
+            max_batch: Maximum number of runs dispatched together.
+        """
+        self.max_batch = max_batch
+        self._queues: Dict[Hashable, asyncio.Queue] = {}
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        # Dispatches in flight; the loop only keeps weak references to tasks
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def submit(self, key: Hashable, run: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Queue an agent run and wait for its result.
+
+        Args:
+            key: Batch key, typically (model_provider, model_id)
+            run: Callable starting the agent run, such as TheoAgent.arun bound to its arguments
+
+        Returns:
+            The agent's run response
+        """
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = asyncio.Queue()
+            self._tasks[key] = asyncio.create_task(self._run_loop(queue))
+
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((run, future))
+        return await future
+
+    async def stop(self) -> None:
+        """
+        Cancel all batching loops.
+        """
+        tasks = [*self._tasks.values(), *self._dispatches]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._dispatches.clear()
+        self._queues.clear()
+
+    async def _run_loop(self, queue: asyncio.Queue) -> None:
+        """
+        Drain the queue into batches and dispatch them.
+
+        Args:
+            queue: The queue of pending runs for one model key
+        """
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            # Dispatch in the background so the next batch can start filling
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatch_done)
+
+    def _dispatch_done(self, task: asyncio.Task) -> None:
+        """
+        Forget a finished dispatch and log it if it failed.
+
+        Args:
+            task: The finished dispatch task
+        """
+        self._dispatches.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Batch dispatch failed: %s", task.exception())
+
+    async def _dispatch(self, batch: List[Tuple[Callable[[], Awaitable[Any]], asyncio.Future]]) -> None:
+        """
+        Run a batch of agent calls concurrently and resolve their futures.
+
+        Args:
+            batch: List of (run, future) tuples
+        """
+        logger.debug("Dispatching batch of %d agent runs", len(batch))
+        results = await asyncio.gather(
+            *(run() for run, _ in batch),
+            return_exceptions=True
+        )
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+# Shared batcher for the process
+batcher = LLMBatcher()
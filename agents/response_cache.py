@@ -0,0 +1,56 @@
+"""
+Response caching for Theo-AI agents.
+
+Identical research requests are common across chats, so agent responses are
+cached for a short time keyed by the prompt, the chat context and the model.
+"""
+import hashlib
+from typing import Any
+
+from utils.cache import TTLCache
+
+# Tools with side effects; responses that used them are never cached
+_SIDE_EFFECT_TOOLS = frozenset({"create_event", "send_message"})
+
+# Cached response content keyed by make_cache_key()
+response_cache = TTLCache(max_size=1024, default_ttl=600.0)
+
+def make_cache_key(
+    formatted_context: str,
+    system_prompt: str,
+    model_provider: str,
+    model_id: str
+) -> str:
+    """
+    Build the cache key for an agent request.
+
+    Args:
+        formatted_context: The formatted chat context sent to the agent
+        system_prompt: The system prompt used for the request
+        model_provider: The model provider
+        model_id: The model ID
+
+    Returns:
+        A hex digest identifying the request
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (system_prompt, formatted_context, model_provider, model_id):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def is_cacheable(run_response: Any) -> bool:
+    """
+    Check whether an agent response can be served again from the cache.
+
+    Responses produced by tools with side effects, such as creating calendar
+    events or sending Telegram messages, must not be replayed.
+
+    Args:
+        run_response: The agno run response
+
+    Returns:
+        True if the response can be cached
+    """
+    tools = getattr(run_response, "tools", None) or []
+    return not any(tool.get("tool_name") in _SIDE_EFFECT_TOOLS for tool in tools)
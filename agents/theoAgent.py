@@ -5,17 +5,24 @@ This module defines the main agno-based agent for Theo-AI.
 The agent integrates web search, web scraping, and scheduling capabilities
 to assist with business development tasks.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Mapping, Optional, Protocol, Sequence, Tuple, Union
+import asyncio
 import os
 import logging
+import time
+from functools import partial
 
-from agno.agent import Agent
+import httpx
+from openai import AsyncOpenAI
+from agno.agent import Agent, RunResponse
 from agno.models.openai import OpenAIChat
 from agno.tools.duckduckgo import DuckDuckGoTools
-from agno.tools.langchain import WebBrowserTools
+from agno.tools.website import WebsiteTools
 from agno.tools.googlecalendar import GoogleCalendarTools
 from agno.tools.telegram import TelegramTools
 
+from agents.batcher import batcher
+from agents.response_cache import is_cacheable, make_cache_key, response_cache
 from models.formation import Formation, FormationChat
 from utils.config import (
     OPENAI_API_KEY, 
@@ -24,13 +31,82 @@ from utils.config import (
     DEFAULT_MODEL_PROVIDER,
     DEFAULT_MODEL_ID,
     FORMATION_API_BASE_URL,
-    GOOGLE_CALENDAR_CREDENTIALS_PATH
+    GOOGLE_CALENDAR_CREDENTIALS_PATH,
+    SHOW_TOOL_CALLS
 )
+from utils.cache import TTLCache
 from utils.logging_utils import setup_logger
 
 # Configure logging
 logger = setup_logger("theo_agent", "theo_agent.log")
 
+# Idle agents keyed by (model_provider, model_id, chat_id), see checkout_agent()
+MAX_IDLE_AGENTS = 4  # Max idle agents kept per key
+_AGENT_CACHE = TTLCache(max_size=128, default_ttl=600.0)
+# Bumped whenever the pool is cleared, so agents checked out before are not returned to it
+_agent_pool_generation = 0
+
+# Shared HTTP/2 connection pool for model provider calls
+_SHARED_TRANSPORT = httpx.AsyncHTTPTransport(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+)
+_SHARED_HTTPX = httpx.AsyncClient(
+    transport=_SHARED_TRANSPORT,
+    timeout=httpx.Timeout(60.0, connect=5.0)
+)
+
+# Stateless toolkits shared by every agent so their HTTP sessions are reused
+_DDG_TOOLS = DuckDuckGoTools()
+_WEB_TOOLS = WebsiteTools()
+
+def _calendar_credentials_available() -> bool:
+    """
+    Check whether the Google Calendar credentials file is configured and present.
+    """
+    return bool(GOOGLE_CALENDAR_CREDENTIALS_PATH) and os.path.exists(GOOGLE_CALENDAR_CREDENTIALS_PATH)
+
+# Checked at import and then at most once per interval, so every worker process
+# notices credentials added at runtime; reload_calendar_credentials() checks immediately
+GCAL_CHECK_INTERVAL = 60.0
+_HAS_GCAL_CREDS = _calendar_credentials_available()
+_next_gcal_check = time.monotonic() + GCAL_CHECK_INTERVAL
+
+def _check_calendar_credentials() -> None:
+    """
+    Re-check for Google Calendar credentials once the check interval has passed.
+    """
+    global _next_gcal_check
+    now = time.monotonic()
+    if now < _next_gcal_check:
+        return
+    _next_gcal_check = now + GCAL_CHECK_INTERVAL
+    if _calendar_credentials_available() != _HAS_GCAL_CREDS:
+        reload_calendar_credentials()
+
+# Agent persona, shared by every TheoAgent instance
+_THEO_DESCRIPTION = "You are Theo-AI, a professional business development research assistant."
+_THEO_INSTRUCTIONS: Tuple[str, ...] = (
+    "Help identify partnership opportunities and business synergies by researching "
+    "companies and individuals mentioned in conversations.",
+    "Always maintain a professional, courteous, and focused tone suitable for business development.",
+    "When you need information, use your web search and web browser tools to gather data about: "
+    "company backgrounds, products, and funding rounds; key personnel and their professional "
+    "backgrounds; potential synergies and partnership opportunities.",
+    "If calendar scheduling is mentioned, help schedule calls using the Google Calendar integration.",
+    "When sending messages to the Telegram chat, use the Telegram tools directly.",
+)
+
+class ChatMessageLike(Protocol):
+    """
+    A chat message exposing `party` and `message` attributes, such as the API's ChatMessage.
+    """
+    party: str
+    message: str
+
+# Chat context accepted by TheoAgent: message dicts or ChatMessage-like objects
+ChatContext = Union[Sequence[Mapping[str, str]], Sequence[ChatMessageLike]]
+
 class TheoAgent:
     """
     Theo-AI agent built on the agno framework.
@@ -55,6 +131,13 @@ class TheoAgent:
         self.model_id = model_id or DEFAULT_MODEL_ID
         self.chat_id = chat_id
         
+        # agno keeps per-run state on the Agent, so runs must not overlap
+        self._run_lock = asyncio.Lock()
+        
+        # Pool bookkeeping, set by checkout_agent()
+        self._pool_key: Optional[Tuple[str, str, Optional[str]]] = None
+        self._pool_generation: Optional[int] = None
+        
         # Initialize the agent
         try:
             # Set up model based on provider
@@ -65,40 +148,44 @@ class TheoAgent:
                 model = Formation(
                     id=self.model_id,
                     api_key=FORMATION_API_KEY,
-                    base_url=FORMATION_API_BASE_URL
+                    base_url=FORMATION_API_BASE_URL,
+                    async_transport=_SHARED_TRANSPORT
                 )
-                logger.info(f"Using Formation model: {self.model_id}")
+                logger.info("Using Formation model: %s", self.model_id)
             elif self.model_provider == 'openai':
                 if not OPENAI_API_KEY:
                     raise ValueError("OpenAI API key is required for OpenAI models")
                 
                 model = OpenAIChat(
                     id=self.model_id,
-                    api_key=OPENAI_API_KEY
+                    api_key=OPENAI_API_KEY,
+                    async_client=AsyncOpenAI(
+                        api_key=OPENAI_API_KEY,
+                        http_client=_SHARED_HTTPX
+                    )
                 )
-                logger.info(f"Using OpenAI model: {self.model_id}")
+                logger.info("Using OpenAI model: %s", self.model_id)
             else:
                 raise ValueError(f"Unsupported model provider: {self.model_provider}")
             
             # Set up tools
             tools = [
-                DuckDuckGoTools(),  # Web search
-                WebBrowserTools(),   # Web browser/scraping
+                _DDG_TOOLS,  # Web search
+                _WEB_TOOLS,  # Web browser/scraping
             ]
             
             # Add Google Calendar Tools using Agno's native implementation
             # Only if credentials path is configured or exists in the default location
-            credentials_path = GOOGLE_CALENDAR_CREDENTIALS_PATH
-            if credentials_path and os.path.exists(credentials_path):
+            if _HAS_GCAL_CREDS:
                 try:
                     tools.append(GoogleCalendarTools(
-                        credentials_path=credentials_path,
+                        credentials_path=GOOGLE_CALENDAR_CREDENTIALS_PATH,
                         # Store token in a specific location for better tracking
                         token_path="./token.json"
                     ))
                     logger.info("Google Calendar Tools added to agent")
                 except Exception as e:
-                    logger.error(f"Failed to initialize Google Calendar Tools: {str(e)}")
+                    logger.error("Failed to initialize Google Calendar Tools: %s", e)
             
             # Add Telegram Tools if chat_id is provided
             if chat_id and TELEGRAM_BOT_TOKEN:
@@ -107,46 +194,35 @@ class TheoAgent:
                         token=TELEGRAM_BOT_TOKEN,
                         chat_id=chat_id
                     ))
-                    logger.info(f"Telegram Tools added for chat ID: {chat_id}")
+                    logger.info("Telegram Tools added for chat ID: %s", chat_id)
                 except Exception as e:
-                    logger.error(f"Failed to initialize Telegram Tools: {str(e)}")
+                    logger.error("Failed to initialize Telegram Tools: %s", e)
             
             # Create agent with the specified model
             self.agent = Agent(
                 model=model,
                 tools=tools,
                 markdown=True,
-                show_tool_calls=True,
-                instructions=[
-                    """
-                    You are Theo-AI, a professional business development research assistant.
-                    You help identify partnership opportunities and business synergies by researching 
-                    companies and individuals mentioned in conversations.
-                    
-                    Always maintain a professional, courteous, and focused tone suitable for business development.
-                    
-                    When you need information, use your web search and web browser tools to gather data about:
-                    - Company backgrounds, products, and funding rounds
-                    - Key personnel and their professional backgrounds
-                    - Potential synergies and partnership opportunities
-                    
-                    If calendar scheduling is mentioned, help schedule calls using the Google Calendar integration.
-                    When sending messages to the Telegram chat, use the Telegram tools directly.
-                    """
-                ]
+                show_tool_calls=SHOW_TOOL_CALLS,
+                description=_THEO_DESCRIPTION,
+                instructions=list(_THEO_INSTRUCTIONS)
             )
             
-            logger.info(f"Theo-AI agent initialized with {self.model_provider} model {self.model_id}")
+            logger.info("Theo-AI agent initialized with %s model %s", self.model_provider, self.model_id)
         except Exception as e:
-            logger.error(f"Error initializing Theo-AI agent: {str(e)}")
+            logger.error("Error initializing Theo-AI agent: %s", e)
             raise
     
-    def process_message(self, chat_context: List[Dict[str, str]], system_prompt: str) -> str:
+    def process_message(self, chat_context: ChatContext, system_prompt: str) -> str:
         """
         Process a message from the Telegram chat.
+
+        This is the blocking variant intended for CLI usage; request handlers
+        should await `aprocess_message` instead.
         
         Args:
-            chat_context: List of messages in the chat, formatted as [{"party": "...", "message": "..."}]
+            chat_context: List of messages in the chat, either dicts formatted as
+                [{"party": "...", "message": "..."}] or ChatMessage models
             system_prompt: System prompt containing rules and reasoning steps
             
         Returns:
@@ -157,35 +233,141 @@ class TheoAgent:
             formatted_context = self._format_chat_context(chat_context)
             
             # Get agent's response
-            response = self.agent.get_response(
-                formatted_context,
-                system_prompt=system_prompt
+            self._prepare_run(system_prompt)
+            run_response = self.agent.run(formatted_context, stream=False)
+            
+            logger.info("Agent response generated successfully")
+            return run_response.content
+        except Exception as e:
+            logger.error("Error processing message: %s", e)
+            return "I encountered an error while processing your request. Please try again later."
+
+    async def aprocess_message(self, chat_context: ChatContext, system_prompt: str) -> str:
+        """
+        Process a message from the Telegram chat without blocking the event loop.
+        
+        Args:
+            chat_context: List of messages in the chat, either dicts formatted as
+                [{"party": "...", "message": "..."}] or ChatMessage models
+            system_prompt: System prompt containing rules and reasoning steps
+            
+        Returns:
+            The agent's response
+        """
+        try:
+            # Format the chat context for the agent
+            formatted_context = self._format_chat_context(chat_context)
+            
+            # Serve repeated requests from the response cache
+            cache_key = make_cache_key(
+                formatted_context, system_prompt, self.model_provider, self.model_id
+            )
+            cached_response = response_cache.get(cache_key)
+            if cached_response is not None:
+                logger.info("Agent response served from cache")
+                return cached_response
+            
+            # Get agent's response
+            run_response = await batcher.submit(
+                (self.model_provider, self.model_id),
+                partial(self.arun, formatted_context, system_prompt)
             )
             
-            logger.info(f"Agent response generated successfully")
-            return response
+            if is_cacheable(run_response):
+                response_cache.set(cache_key, run_response.content)
+            
+            logger.info("Agent response generated successfully")
+            return run_response.content
         except Exception as e:
-            error_msg = f"Error processing message: {str(e)}"
-            logger.error(error_msg)
-            return f"I encountered an error while processing your request. Please try again later."
+            logger.error("Error processing message: %s", e)
+            return "I encountered an error while processing your request. Please try again later."
+    
+    async def astream_message(self, chat_context: ChatContext, system_prompt: str) -> AsyncIterator[str]:
+        """
+        Stream the agent's response to a message from the Telegram chat.
+        
+        Args:
+            chat_context: List of messages in the chat, either dicts formatted as
+                [{"party": "...", "message": "..."}] or ChatMessage models
+            system_prompt: System prompt containing rules and reasoning steps
+            
+        Yields:
+            Chunks of the agent's response as they are generated
+        """
+        formatted_context = self._format_chat_context(chat_context)
+        
+        async with self._run_lock:
+            self._prepare_run(system_prompt)
+            async for chunk in await self.agent.arun(formatted_context, stream=True):
+                if chunk.content:
+                    yield chunk.content
+        
+        logger.info("Agent response streamed successfully")
+    
+    async def arun(self, formatted_context: str, system_prompt: str) -> RunResponse:
+        """
+        Run the agent once, waiting for any run already in progress.
+        
+        The system prompt is set on the agent inside the run lock, so a
+        concurrent request cannot replace it before this run reads it.
+        
+        Args:
+            formatted_context: The formatted chat context
+            system_prompt: System prompt containing rules and reasoning steps
+            
+        Returns:
+            The agent's run response
+        """
+        async with self._run_lock:
+            self._prepare_run(system_prompt)
+            return await self.agent.arun(formatted_context, stream=False)
+    
+    def _prepare_run(self, system_prompt: str) -> None:
+        """
+        Set the per-run state on the agno agent; callers must hold the run lock.
+        
+        agno only ever turns `stream` on (`self.stream = self.stream or stream`),
+        so after one streamed run every later run would stream too. Both streaming
+        flags are reset so each run follows the `stream` argument it is given.
+        
+        Args:
+            system_prompt: System prompt containing rules and reasoning steps
+        """
+        self.agent.additional_context = system_prompt
+        self.agent.stream = None
+        self.agent.stream_intermediate_steps = False
     
-    def _format_chat_context(self, chat_context: List[Dict[str, str]]) -> str:
+    def _format_chat_context(self, chat_context: ChatContext) -> str:
         """
         Format the chat context for the agent.
         
         Args:
-            chat_context: List of messages in the chat
+            chat_context: List of messages in the chat, as dicts or ChatMessage-like objects
             
         Returns:
             Formatted context string
         """
-        formatted_messages = []
-        for message in chat_context:
-            party = message.get("party", "Unknown")
-            content = message.get("message", "")
-            formatted_messages.append(f"{party}: {content}")
+        if chat_context and not isinstance(chat_context[0], Mapping):
+            return self._format_chat_messages(chat_context)
         
-        return "\n".join(formatted_messages)
+        return "\n".join(
+            f'{message.get("party", "Unknown")}: {message.get("message", "")}'
+            for message in chat_context
+        )
+
+    @staticmethod
+    def _format_chat_messages(messages: Sequence[ChatMessageLike]) -> str:
+        """
+        Format chat messages that expose `party` and `message` attributes,
+        such as the API's ChatMessage models.
+        
+        Args:
+            messages: List of chat message objects
+            
+        Returns:
+            Formatted context string
+        """
+        return "\n".join(f"{m.party}: {m.message}" for m in messages)
 
 def create_agent(
     model_provider: Optional[str] = None,
@@ -207,4 +389,81 @@ def create_agent(
         model_provider=model_provider,
         model_id=model_id,
         chat_id=chat_id
-    ) 
\ No newline at end of file
+    )
+
+def checkout_agent(
+    model_provider: Optional[str] = None,
+    model_id: Optional[str] = None, 
+    chat_id: Optional[str] = None
+) -> TheoAgent:
+    """
+    Check out an idle Theo-AI agent, creating one if none is available.
+    
+    Idle agents are pooled per (model_provider, model_id, chat_id) so repeat
+    requests skip model, tool and credential setup. The chat ID is part of the
+    key because the Telegram tools are bound to it. A checked-out agent belongs
+    to the caller alone until it is handed back with release_agent(), so
+    concurrent requests for the same key each get their own agent. An agent
+    that is never released is simply not reused.
+    
+    Args:
+        model_provider: Optional model provider ('formation', 'openai', etc.)
+        model_id: Optional model ID to use
+        chat_id: Optional Telegram chat ID to send messages to
+        
+    Returns:
+        An initialized TheoAgent instance
+    """
+    _check_calendar_credentials()
+    key = (
+        model_provider or DEFAULT_MODEL_PROVIDER,
+        model_id or DEFAULT_MODEL_ID,
+        chat_id
+    )
+    idle_agents = _AGENT_CACHE.get(key)
+    if idle_agents:
+        return idle_agents.pop()
+    agent = create_agent(*key)
+    agent._pool_key = key
+    agent._pool_generation = _agent_pool_generation
+    return agent
+
+def release_agent(agent: TheoAgent) -> None:
+    """
+    Hand a checked-out agent back to the pool once its run has finished.
+    
+    Agents created before the pool was last cleared are dropped, so they
+    do not bring back outdated tools.
+    
+    Args:
+        agent: An agent returned by checkout_agent()
+    """
+    if agent._pool_generation != _agent_pool_generation:
+        return
+    idle_agents = _AGENT_CACHE.get(agent._pool_key)
+    if idle_agents is None:
+        idle_agents = []
+    if len(idle_agents) < MAX_IDLE_AGENTS:
+        idle_agents.append(agent)
+    # Setting the entry again restarts its time-to-live
+    _AGENT_CACHE.set(agent._pool_key, idle_agents)
+
+def reload_calendar_credentials() -> bool:
+    """
+    Re-check for Google Calendar credentials added at runtime.
+    
+    Cached agents are dropped so new agents pick up the calendar tools. This
+    only affects the calling process; other workers notice the change on their
+    next request after GCAL_CHECK_INTERVAL seconds.
+    
+    Returns:
+        Whether Google Calendar credentials are available
+    """
+    global _HAS_GCAL_CREDS, _agent_pool_generation
+    _HAS_GCAL_CREDS = _calendar_credentials_available()
+    _agent_pool_generation += 1
+    _AGENT_CACHE.clear()
+    logger.info("Google Calendar credentials available: %s", _HAS_GCAL_CREDS)
+    return _HAS_GCAL_CREDS
+
+__all__ = ["TheoAgent", "create_agent", "checkout_agent", "release_agent", "reload_calendar_credentials"]
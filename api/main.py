@@ -5,39 +5,64 @@ This module implements the API endpoints for Theo-AI using FastAPI.
 It handles chat message processing and scheduling requests.
 """
 import os
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import json
 
 from fastapi import FastAPI, HTTPException, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import APIKeyHeader
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+import orjson
 import uvicorn
 
-from agents.theoAgent import create_agent
-from utils.config import API_SECRET_KEY, DEFAULT_MODEL_PROVIDER, DEFAULT_MODEL_ID
+from agents.batcher import batcher
+from agents.theoAgent import checkout_agent, release_agent, reload_calendar_credentials
+from integrations.googleCalendar import acreate_calendar_event
+from models.formation import aclose_shared_clients
+from utils.config import (
+    API_SECRET_KEY,
+    CORS_ALLOW_ORIGINS,
+    DEFAULT_MODEL_PROVIDER,
+    DEFAULT_MODEL_ID
+)
 from utils.logging_utils import setup_logger
 
 # Configure logging
 logger = setup_logger("api", "api.log")
 
-# Create FastAPI app
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Stop the agent batching loops and close pooled model clients when the server shuts down.
+    """
+    yield
+    await batcher.stop()
+    await aclose_shared_clients()
+
+# Create FastAPI app; routes with a response model are serialized to JSON by Pydantic directly
 app = FastAPI(
     title="Theo-AI API",
     description="API for Theo-AI, a Telegram Helper for Enterprise Ops",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Enable CORS
+# Enable CORS (browsers reject credentials with a wildcard origin)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=CORS_ALLOW_ORIGINS,
+    allow_credentials="*" not in CORS_ALLOW_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Compress large responses such as long research answers
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # API Key security
 api_key_header = APIKeyHeader(name="X-API-Key")
 
@@ -54,10 +79,14 @@ def verify_api_key(api_key: str = Depends(api_key_header)):
 
 # Define request/response models
 class ChatMessage(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     party: str
     message: str
 
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     chatContext: List[ChatMessage]
     systemPrompt: str
     apiKeys: Optional[Dict[str, str]] = None
@@ -66,12 +95,16 @@ class ChatRequest(BaseModel):
     chatId: Optional[str] = None
 
 class ChatResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     response: str
     researchData: Optional[Dict[str, Any]] = None
     schedulingInfo: Optional[Dict[str, Any]] = None
     modelInfo: Optional[Dict[str, str]] = None
 
 class ScheduleRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     summary: str
     description: Optional[str] = ""
     attendees: List[str]
@@ -80,12 +113,16 @@ class ScheduleRequest(BaseModel):
     timeZone: Optional[str] = "UTC"
 
 class ScheduleResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     eventId: Optional[str] = None
     eventLink: Optional[str] = None
     message: str
     error: Optional[str] = None
 
 class ErrorResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     error: str
     details: Optional[Dict[str, Any]] = None
 
@@ -96,26 +133,23 @@ async def process_chat(request: ChatRequest):
     Process a chat message and return the agent's response.
     """
     try:
-        # Convert Pydantic model to dict format expected by agent
-        chat_context = [
-            {"party": msg.party, "message": msg.message}
-            for msg in request.chatContext
-        ]
-        
         # Log model selection
         model_provider = request.modelProvider or DEFAULT_MODEL_PROVIDER
         model_id = request.modelId or DEFAULT_MODEL_ID
-        logger.info(f"Using model provider: {model_provider}, model: {model_id}")
+        logger.info("Using model provider: %s, model: %s", model_provider, model_id)
         
-        # Create an agent with the specified model
-        agent = create_agent(
+        # Get an agent for the specified model
+        agent = checkout_agent(
             model_provider=model_provider,
             model_id=model_id,
             chat_id=request.chatId
         )
         
         # Process the chat context
-        response = agent.process_message(chat_context, request.systemPrompt)
+        try:
+            response = await agent.aprocess_message(request.chatContext, request.systemPrompt)
+        finally:
+            release_agent(agent)
         
         # Return the response
         return ChatResponse(
@@ -129,12 +163,83 @@ async def process_chat(request: ChatRequest):
         )
         
     except Exception as e:
-        logger.error(f"Error processing chat request: {str(e)}")
+        logger.error("Error processing chat request: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing chat request: {str(e)}"
         )
 
+@app.post("/chat/stream", dependencies=[Depends(verify_api_key)])
+async def stream_chat(request: ChatRequest):
+    """
+    Process a chat message and stream the agent's response as server-sent events.
+    
+    Each event carries a JSON object with a `delta` text chunk; the stream ends
+    with a `[DONE]` event.
+    """
+    model_provider = request.modelProvider or DEFAULT_MODEL_PROVIDER
+    model_id = request.modelId or DEFAULT_MODEL_ID
+    
+    try:
+        agent = checkout_agent(
+            model_provider=model_provider,
+            model_id=model_id,
+            chat_id=request.chatId
+        )
+    except Exception as e:
+        logger.error("Error processing chat request: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing chat request: {str(e)}"
+        )
+    
+    async def event_stream():
+        try:
+            async for delta in agent.astream_message(request.chatContext, request.systemPrompt):
+                yield b"data: " + orjson.dumps({"delta": delta}) + b"\n\n"
+        except Exception as e:
+            logger.error("Error streaming chat response: %s", e)
+            yield b"data: " + orjson.dumps({
+                "error": "I encountered an error while processing your request. Please try again later."
+            }) + b"\n\n"
+        finally:
+            release_agent(agent)
+        yield b"data: [DONE]\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+@app.post("/schedule", response_model=ScheduleResponse, dependencies=[Depends(verify_api_key)])
+async def schedule_call(request: ScheduleRequest):
+    """
+    Create a Google Calendar event for a scheduled call.
+    """
+    result = await acreate_calendar_event(
+        summary=request.summary,
+        description=request.description or "",
+        start_time=request.startTime,
+        end_time=request.endTime,
+        attendees=request.attendees,
+        time_zone=request.timeZone or "UTC"
+    )
+    
+    if "error" in result:
+        return ScheduleResponse(
+            message="Failed to create calendar event",
+            error=result["error"]
+        )
+    
+    return ScheduleResponse(**result)
+
+@app.post("/admin/reload-credentials", dependencies=[Depends(verify_api_key)])
+async def reload_credentials():
+    """
+    Re-check for Google Calendar credentials added since startup.
+    
+    The check runs in the worker serving this request; other workers pick up
+    the change on their own within GCAL_CHECK_INTERVAL seconds.
+    """
+    return {"googleCalendar": reload_calendar_credentials()}
+
 @app.get("/health")
 async def health_check():
     """
@@ -190,5 +295,23 @@ async def root():
     }
 
 # Run the server if executed directly
+def main() -> None:
+    """
+    Run the API server with uvicorn.
+    """
+    # Auto-reload only makes sense for a single dev worker. Each worker keeps its
+    # own agent cache and batcher, so more workers are opt-in via WEB_CONCURRENCY.
+    dev_mode = bool(os.getenv("DEV"))
+    uvicorn.run(
+        "api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        # uvloop and httptools when installed; they are not available on Windows
+        loop="auto",
+        http="auto",
+        workers=1 if dev_mode else int(os.getenv("WEB_CONCURRENCY", "1")),
+        reload=dev_mode
+    )
+
 if __name__ == "__main__":
-    uvicorn.run("api.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    main() 
\ No newline at end of file
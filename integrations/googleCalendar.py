@@ -3,50 +3,47 @@ Google Calendar Integration for Theo-AI.
 
 This module provides functions to interact with the Google Calendar API,
 allowing the creation of calendar events for scheduled calls.
+
+create_calendar_event blocks on the Google API client. Async callers (such as
+FastAPI endpoints) must await acreate_calendar_event instead, or wrap the sync
+call in asyncio.to_thread, so the event loop is never stalled.
 """
+import asyncio
 import os
-import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-import json
 
+import orjson
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 
+try:
+    from aiogoogle import Aiogoogle
+    from aiogoogle.auth.creds import ClientCreds, UserCreds
+except ImportError:
+    Aiogoogle = None
+
 from utils.config import (
     GOOGLE_CALENDAR_CLIENT_ID,
     GOOGLE_CALENDAR_CLIENT_SECRET,
     GOOGLE_CALENDAR_REDIRECT_URI
 )
+from utils.logging_utils import setup_logger
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("logs/google_calendar.log"),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
+logger = setup_logger("google_calendar", "google_calendar.log")
 
 # If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 TOKEN_FILE = 'token.json'
 CREDENTIALS_FILE = 'credentials.json'
 
-def create_credentials_file():
-    """
-    Create a credentials.json file from environment variables.
-    This is needed for the OAuth2 flow.
-    """
-    if not all([GOOGLE_CALENDAR_CLIENT_ID, GOOGLE_CALENDAR_CLIENT_SECRET, GOOGLE_CALENDAR_REDIRECT_URI]):
-        logger.error("Missing Google Calendar credentials in environment variables")
-        return False
-    
-    credentials_data = {
+# OAuth client configuration built from environment variables, kept in memory
+_CLIENT_CONFIG: Optional[Dict[str, Any]] = None
+if all([GOOGLE_CALENDAR_CLIENT_ID, GOOGLE_CALENDAR_CLIENT_SECRET, GOOGLE_CALENDAR_REDIRECT_URI]):
+    _CLIENT_CONFIG = {
         "installed": {
             "client_id": GOOGLE_CALENDAR_CLIENT_ID,
             "project_id": "theo-ai",
@@ -57,31 +54,73 @@ def create_credentials_file():
             "redirect_uris": [GOOGLE_CALENDAR_REDIRECT_URI]
         }
     }
+
+# Authenticated services keyed by token file: (token mtime, credentials, service)
+_SERVICE_CACHE: Dict[str, Tuple[Optional[float], Credentials, Any]] = {}
+
+# Discovered Calendar API for the async client
+_ASYNC_CALENDAR_API = None
+
+def _token_mtime() -> Optional[float]:
+    """
+    Get the modification time of token.json, or None if it does not exist.
+    """
+    try:
+        return os.path.getmtime(TOKEN_FILE)
+    except OSError:
+        return None
+
+def _save_token(creds: Credentials) -> None:
+    """
+    Write credentials to token.json, so refreshed tokens are reused by every process.
     
+    The file is replaced atomically so other processes never read a partial token.
+    """
+    tmp_file = f"{TOKEN_FILE}.tmp"
     try:
-        with open(CREDENTIALS_FILE, 'w') as f:
-            json.dump(credentials_data, f)
-        logger.info("Created credentials.json file")
-        return True
-    except Exception as e:
-        logger.error(f"Error creating credentials.json: {str(e)}")
-        return False
+        with open(tmp_file, 'w') as token:
+            token.write(creds.to_json())
+        os.replace(tmp_file, TOKEN_FILE)
+    except OSError as e:
+        logger.error(f"Error saving credentials to {TOKEN_FILE}: {str(e)}")
 
-def get_calendar_service():
+def get_calendar_service(interactive: bool = True):
     """
     Get an authenticated Google Calendar service.
     
+    The service is cached and reused until token.json changes on disk.
+    Expired credentials are refreshed in place and written back to token.json.
+    
+    Args:
+        interactive: Whether to run the browser OAuth flow when no token exists.
+            Servers must pass False, since nobody is there to complete the flow.
+    
     Returns:
         A Google Calendar API service object or None if authentication fails.
     """
+    cached = _SERVICE_CACHE.get(TOKEN_FILE)
+    if cached and cached[0] == _token_mtime():
+        _, creds, service = cached
+        if creds.valid:
+            return service
+        if creds.expired and creds.refresh_token:
+            try:
+                creds.refresh(Request())
+                _save_token(creds)
+                _SERVICE_CACHE[TOKEN_FILE] = (_token_mtime(), creds, service)
+                return service
+            except Exception as e:
+                logger.error(f"Error refreshing credentials: {str(e)}")
+                return None
+    
     creds = None
     
     # Check if token.json exists
     if os.path.exists(TOKEN_FILE):
         try:
-            creds = Credentials.from_authorized_user_info(
-                json.load(open(TOKEN_FILE))
-            )
+            with open(TOKEN_FILE, 'rb') as f:
+                token_data = orjson.loads(f.read())
+            creds = Credentials.from_authorized_user_info(token_data)
         except Exception as e:
             logger.error(f"Error loading credentials from token.json: {str(e)}")
     
@@ -93,30 +132,83 @@ def get_calendar_service():
             except Exception as e:
                 logger.error(f"Error refreshing credentials: {str(e)}")
                 return None
+            _save_token(creds)
+        elif not interactive:
+            logger.error("No Google Calendar token found; run the OAuth flow once to create token.json")
+            return None
         else:
-            # Check if credentials.json exists, if not, create it
-            if not os.path.exists(CREDENTIALS_FILE):
-                if not create_credentials_file():
-                    return None
-            
+            # Prefer the client config from the environment, fall back to credentials.json
             try:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    CREDENTIALS_FILE, SCOPES)
+                if _CLIENT_CONFIG:
+                    flow = InstalledAppFlow.from_client_config(_CLIENT_CONFIG, SCOPES)
+                elif os.path.exists(CREDENTIALS_FILE):
+                    flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_FILE, SCOPES)
+                else:
+                    logger.error("Missing Google Calendar credentials in environment variables")
+                    return None
                 creds = flow.run_local_server(port=0)
             except Exception as e:
                 logger.error(f"Error during authentication flow: {str(e)}")
                 return None
             
             # Save the credentials for the next run
-            with open(TOKEN_FILE, 'w') as token:
-                token.write(creds.to_json())
+            _save_token(creds)
     
     try:
-        service = build('calendar', 'v3', credentials=creds)
-        return service
+        service = build(
+            'calendar', 'v3',
+            credentials=creds,
+            cache_discovery=False,
+            static_discovery=True
+        )
     except Exception as e:
         logger.error(f"Error building calendar service: {str(e)}")
         return None
+    
+    _SERVICE_CACHE[TOKEN_FILE] = (_token_mtime(), creds, service)
+    return service
+
+def get_calendar_credentials(interactive: bool = True) -> Optional[Credentials]:
+    """
+    Get valid Google Calendar OAuth credentials.
+    
+    Args:
+        interactive: Whether to run the browser OAuth flow when no token exists.
+    
+    Returns:
+        The cached credentials or None if authentication fails.
+    """
+    if not get_calendar_service(interactive):
+        return None
+    return _SERVICE_CACHE[TOKEN_FILE][1]
+
+def _build_event(
+    summary: str,
+    description: str,
+    start_time: str,
+    end_time: str,
+    attendees: List[str],
+    time_zone: str
+) -> Dict[str, Any]:
+    """
+    Build the request body for a Google Calendar event.
+    """
+    return {
+        'summary': summary,
+        'description': description,
+        'start': {
+            'dateTime': start_time,
+            'timeZone': time_zone,
+        },
+        'end': {
+            'dateTime': end_time,
+            'timeZone': time_zone,
+        },
+        'attendees': [{'email': email} for email in attendees],
+        'reminders': {
+            'useDefault': True
+        },
+    }
 
 def create_calendar_event(
     summary: str,
@@ -124,7 +216,8 @@ def create_calendar_event(
     start_time: str,
     end_time: str,
     attendees: List[str],
-    time_zone: str = 'UTC'
+    time_zone: str = 'UTC',
+    interactive: bool = True
 ) -> Dict[str, Any]:
     """
     Create a Google Calendar event.
@@ -136,37 +229,97 @@ def create_calendar_event(
         end_time: End time in ISO format (YYYY-MM-DDTHH:MM:SS)
         attendees: List of attendee email addresses
         time_zone: Time zone for the event
+        interactive: Whether to run the browser OAuth flow when no token exists
     
     Returns:
         A dictionary containing event details or an error message
     """
     try:
-        service = get_calendar_service()
+        service = get_calendar_service(interactive)
         if not service:
             return {"error": "Failed to authenticate with Google Calendar"}
         
-        # Format attendees
-        attendee_list = [{'email': email} for email in attendees]
-        
         # Create event
-        event = {
-            'summary': summary,
-            'description': description,
-            'start': {
-                'dateTime': start_time,
-                'timeZone': time_zone,
-            },
-            'end': {
-                'dateTime': end_time,
-                'timeZone': time_zone,
-            },
-            'attendees': attendee_list,
-            'reminders': {
-                'useDefault': True
-            },
+        event = _build_event(summary, description, start_time, end_time, attendees, time_zone)
+        created_event = service.events().insert(calendarId='primary', body=event).execute()
+        
+        # Return success response
+        return {
+            "eventId": created_event['id'],
+            "eventLink": created_event.get('htmlLink', ''),
+            "message": "Calendar event created successfully"
         }
+    
+    except Exception as e:
+        error_msg = f"Error creating calendar event: {str(e)}"
+        logger.error(error_msg)
+        return {"error": error_msg}
+
+async def acreate_calendar_event(
+    summary: str,
+    description: str,
+    start_time: str,
+    end_time: str,
+    attendees: List[str],
+    time_zone: str = 'UTC'
+) -> Dict[str, Any]:
+    """
+    Create a Google Calendar event without blocking the event loop.
+    
+    Uses aiogoogle for the API call. The discovered Calendar API is cached
+    at module scope so discovery only happens once per process. If aiogoogle
+    is not installed, the sync client is run in a worker thread instead.
+    
+    The browser OAuth flow is never started here; without a token.json the
+    call fails immediately instead of tying up a worker thread.
+    
+    Args:
+        summary: Title of the event
+        description: Description of the event
+        start_time: Start time in ISO format (YYYY-MM-DDTHH:MM:SS)
+        end_time: End time in ISO format (YYYY-MM-DDTHH:MM:SS)
+        attendees: List of attendee email addresses
+        time_zone: Time zone for the event
+    
+    Returns:
+        A dictionary containing event details or an error message
+    """
+    global _ASYNC_CALENDAR_API
+    
+    if Aiogoogle is None:
+        return await asyncio.to_thread(
+            create_calendar_event,
+            summary, description, start_time, end_time, attendees, time_zone,
+            interactive=False
+        )
+    
+    try:
+        # Loading or refreshing credentials touches disk and the network
+        creds = await asyncio.to_thread(get_calendar_credentials, False)
+        if not creds:
+            return {"error": "Failed to authenticate with Google Calendar"}
         
-        created_event = service.events().insert(calendarId='primary', body=event).execute()
+        user_creds = UserCreds(
+            access_token=creds.token,
+            refresh_token=creds.refresh_token,
+            expires_at=creds.expiry.isoformat() if creds.expiry else None,
+            scopes=SCOPES
+        )
+        client_creds = ClientCreds(
+            client_id=creds.client_id,
+            client_secret=creds.client_secret,
+            scopes=SCOPES
+        )
+        
+        event = _build_event(summary, description, start_time, end_time, attendees, time_zone)
+        
+        async with Aiogoogle(user_creds=user_creds, client_creds=client_creds) as aiogoogle:
+            if _ASYNC_CALENDAR_API is None:
+                _ASYNC_CALENDAR_API = await aiogoogle.discover('calendar', 'v3')
+            
+            created_event = await aiogoogle.as_user(
+                _ASYNC_CALENDAR_API.events.insert(calendarId='primary', json=event)
+            )
         
         # Return success response
         return {
@@ -178,4 +331,4 @@ def create_calendar_event(
     except Exception as e:
         error_msg = f"Error creating calendar event: {str(e)}"
         logger.error(error_msg)
-        return {"error": error_msg} 
\ No newline at end of file
+        return {"error": error_msg}
@@ -3,13 +3,18 @@ Formation model implementation for the agno framework.
 
 This module provides support for Formation Cloud's model API.
 """
+import atexit
 import json
+import threading
 from collections.abc import AsyncIterator
-from dataclasses import asdict, dataclass
+from contextlib import contextmanager
+from functools import lru_cache
+from dataclasses import asdict, dataclass, field
 from os import getenv
-from typing import Any, Dict, Iterator, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import httpx
+import orjson
 
 from agno.exceptions import ModelProviderError
 from agno.models.base import Model
@@ -19,6 +24,93 @@ from agno.utils.log import get_logger, log_error, log_warning
 
 logger = get_logger(__name__)
 
+# Chat completions endpoint, relative to the client's base URL
+_CHAT_COMPLETIONS_PATH = "/chat/completions"
+
+# Prefix of the server-sent event lines that carry a completion chunk
+_DATA_PREFIX = "data:"
+
+@lru_cache(maxsize=1)
+def _default_api_key() -> Optional[str]:
+    """
+    Get the Formation API key from the environment, read once per process.
+    """
+    return getenv("FORMATION_API_KEY")
+
+
+@lru_cache(maxsize=1)
+def _default_base_url() -> str:
+    """
+    Get the Formation API base URL from the environment, read once per process.
+    """
+    return getenv("FORMATION_API_BASE_URL", "https://agents.formation.cloud/v1")
+
+
+# Attributes that feed into request_kwargs and to_dict; changing any of them drops the cached dicts
+_REQUEST_PARAM_FIELDS = frozenset({
+    "id",
+    "temperature",
+    "max_tokens",
+    "top_p",
+    "stop",
+    "frequency_penalty",
+    "presence_penalty",
+    "seed",
+    "request_params",
+    "response_format",
+    "_tools",
+    "tool_choice",
+})
+
+# Attributes that feed into the request headers; changing either drops the cached headers
+_HEADER_FIELDS = frozenset({"api_key", "default_headers"})
+
+_MISSING = object()
+
+# HTTP clients shared by Formation models, keyed by Formation._shared_client_key()
+_SHARED_CLIENTS: Dict[Tuple[Any, ...], httpx.Client] = {}
+_SHARED_ASYNC_CLIENTS: Dict[Tuple[Any, ...], httpx.AsyncClient] = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+
+def _close_shared_clients() -> None:
+    """
+    Close the shared synchronous HTTP clients at interpreter exit.
+    """
+    with _SHARED_CLIENTS_LOCK:
+        for client in _SHARED_CLIENTS.values():
+            client.close()
+        _SHARED_CLIENTS.clear()
+
+
+atexit.register(_close_shared_clients)
+
+
+async def aclose_shared_clients() -> None:
+    """
+    Close the shared asynchronous HTTP clients.
+
+    Call this from the event loop that used them, e.g. on server shutdown.
+    """
+    with _SHARED_CLIENTS_LOCK:
+        async_clients = list(_SHARED_ASYNC_CLIENTS.values())
+        _SHARED_ASYNC_CLIENTS.clear()
+    for async_client in async_clients:
+        await async_client.aclose()
+
+
+# Request parameters included in to_dict() when set
+_TO_DICT_FIELDS = (
+    "temperature",
+    "max_tokens",
+    "top_p",
+    "stop",
+    "frequency_penalty",
+    "presence_penalty",
+    "seed",
+    "response_format",
+)
+
 
 @dataclass
 class Formation(Model):
@@ -47,12 +139,13 @@ class Formation(Model):
         api_key (Optional[str]): The API key for authenticating with Formation Cloud.
         base_url (Optional[Union[str, httpx.URL]]): The base URL for API requests.
         timeout (Optional[float]): The timeout for API requests.
-        max_retries (Optional[int]): The maximum number of retries for failed requests.
+        max_retries (Optional[int]): The maximum number of retries for failed connections.
         default_headers (Optional[Any]): Default headers to include in all requests.
         default_query (Optional[Any]): Default query parameters to include in all requests.
         client_params (Optional[Dict[str, Any]]): Additional parameters for client configuration.
         client (Optional[httpx.Client]): An optional pre-configured HTTP client.
         async_client (Optional[httpx.AsyncClient]): An optional pre-configured async HTTP client.
+        async_transport (Optional[httpx.AsyncBaseTransport]): An optional shared transport (connection pool) for the async client.
     """
 
     id: str = "best-quality"
@@ -82,6 +175,56 @@ class Formation(Model):
     # HTTP clients
     client: Optional[httpx.Client] = None
     async_client: Optional[httpx.AsyncClient] = None
+    async_transport: Optional[httpx.AsyncBaseTransport] = None
+
+    # Request kwargs built from the parameters above, rebuilt after they change
+    _cached_request_kwargs: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _cached_stream_kwargs: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _cached_to_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _cached_headers: Optional[Dict[str, str]] = field(default=None, init=False, repr=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in _REQUEST_PARAM_FIELDS and name not in _HEADER_FIELDS:
+            super().__setattr__(name, value)
+            return
+
+        # agno reassigns fields such as response_format on every run; only real changes invalidate
+        old = getattr(self, name, _MISSING)
+        super().__setattr__(name, value)
+        if old is value or old == value:
+            return
+        if name in _REQUEST_PARAM_FIELDS:
+            self.invalidate_request_cache()
+        else:
+            object.__setattr__(self, "_cached_headers", None)
+
+    def invalidate_request_cache(self) -> None:
+        """
+        Drop the cached request kwargs so they are rebuilt on the next request.
+
+        Assigning a new value to a request parameter does this automatically; call it after
+        mutating a parameter in place (e.g. updating `request_params`).
+        """
+        object.__setattr__(self, "_cached_request_kwargs", None)
+        object.__setattr__(self, "_cached_stream_kwargs", None)
+        object.__setattr__(self, "_cached_to_dict", None)
+
+    @property
+    def _headers(self) -> Dict[str, str]:
+        """
+        Returns the headers sent with every request, cached until `api_key` or `default_headers` changes.
+
+        Returns:
+            Dict[str, str]: The request headers.
+        """
+        if self._cached_headers is None:
+            headers = {"Content-Type": "application/json"}
+            if self.api_key is not None:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            if self.default_headers is not None:
+                headers.update(self.default_headers)
+            self._cached_headers = headers
+        return self._cached_headers
 
     def get_client_params(self) -> Dict[str, Any]:
         """
@@ -90,27 +233,25 @@ class Formation(Model):
         Returns:
             Dict[str, Any]: A dictionary of client parameters
         """
-        self.api_key = self.api_key or getenv("FORMATION_API_KEY")
+        if not self.api_key:
+            self.api_key = _default_api_key()
         if not self.api_key:
             log_error("FORMATION_API_KEY not set. Please set the FORMATION_API_KEY environment variable.")
 
-        self.base_url = self.base_url or getenv("FORMATION_API_BASE_URL", "https://agents.formation.cloud/v1")
+        self.base_url = self.base_url or _default_base_url()
 
         _client_params: Dict[str, Any] = {
             "base_url": self.base_url,
             "timeout": self.timeout or 120.0,
-            "headers": {"Content-Type": "application/json"}
+            "headers": self._headers,
+            "limits": httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=128,
+                keepalive_expiry=60.0
+            ),
+            "http2": True,
         }
         
-        if self.api_key is not None:
-            _client_params["headers"]["Authorization"] = f"Bearer {self.api_key}"
-        
-        if self.max_retries is not None:
-            _client_params["max_retries"] = self.max_retries
-            
-        if self.default_headers is not None:
-            _client_params["headers"].update(self.default_headers)
-            
         if self.default_query is not None:
             _client_params["params"] = self.default_query
             
@@ -119,10 +260,62 @@ class Formation(Model):
             
         return _client_params
 
+    def _shared_client_key(self) -> Optional[Tuple[Any, ...]]:
+        """
+        Get the key under which this model's HTTP clients are shared.
+
+        Models with custom headers, query parameters or client params get
+        their own clients, so no key is returned for them.
+
+        Returns:
+            Optional[Tuple[Any, ...]]: The shared client key, or None.
+        """
+        if self.default_headers is not None or self.default_query is not None or self.client_params is not None:
+            return None
+        return (str(self.base_url), self.api_key, self.timeout, self.max_retries)
+
+    def _new_client(self, client_params: Dict[str, Any]) -> httpx.Client:
+        """
+        Create an HTTP client, retrying failed connections `max_retries` times.
+
+        Args:
+            client_params (Dict[str, Any]): Parameters from get_client_params().
+
+        Returns:
+            httpx.Client: A new HTTP client.
+        """
+        if self.max_retries and "transport" not in client_params:
+            client_params["transport"] = httpx.HTTPTransport(
+                retries=self.max_retries,
+                http2=client_params["http2"],
+                limits=client_params["limits"],
+            )
+        return httpx.Client(**client_params)
+
+    def _new_async_client(self, client_params: Dict[str, Any]) -> httpx.AsyncClient:
+        """
+        Create an asynchronous HTTP client, retrying failed connections `max_retries` times.
+
+        Args:
+            client_params (Dict[str, Any]): Parameters from get_client_params().
+
+        Returns:
+            httpx.AsyncClient: A new asynchronous HTTP client.
+        """
+        if self.max_retries and "transport" not in client_params:
+            client_params["transport"] = httpx.AsyncHTTPTransport(
+                retries=self.max_retries,
+                http2=client_params["http2"],
+                limits=client_params["limits"],
+            )
+        return httpx.AsyncClient(**client_params)
+
     def get_client(self) -> httpx.Client:
         """
         Returns an HTTP client for Formation Cloud API requests.
 
+        Models with the same endpoint and credentials share one client.
+
         Returns:
             httpx.Client: An instance of the HTTP client.
         """
@@ -130,13 +323,24 @@ class Formation(Model):
             return self.client
 
         _client_params = self.get_client_params()
-        self.client = httpx.Client(**_client_params)
+        key = self._shared_client_key()
+        if key is None:
+            self.client = self._new_client(_client_params)
+            return self.client
+
+        with _SHARED_CLIENTS_LOCK:
+            client = _SHARED_CLIENTS.get(key)
+            if client is None or client.is_closed:
+                client = _SHARED_CLIENTS[key] = self._new_client(_client_params)
+        self.client = client
         return self.client
 
     def get_async_client(self) -> httpx.AsyncClient:
         """
         Returns an asynchronous HTTP client for Formation Cloud API requests.
 
+        Models with the same endpoint, credentials and transport share one client.
+
         Returns:
             httpx.AsyncClient: An instance of the asynchronous HTTP client.
         """
@@ -144,14 +348,79 @@ class Formation(Model):
             return self.async_client
 
         _client_params = self.get_client_params()
-        self.async_client = httpx.AsyncClient(**_client_params)
+        if self.async_transport is not None:
+            _client_params["transport"] = self.async_transport
+
+        key = self._shared_client_key()
+        if key is None:
+            self.async_client = self._new_async_client(_client_params)
+            return self.async_client
+
+        key += (self.async_transport,)
+        with _SHARED_CLIENTS_LOCK:
+            async_client = _SHARED_ASYNC_CLIENTS.get(key)
+            if async_client is None or async_client.is_closed:
+                async_client = _SHARED_ASYNC_CLIENTS[key] = self._new_async_client(_client_params)
+        self.async_client = async_client
         return self.async_client
 
+    def close(self) -> None:
+        """
+        Close the HTTP client, if one was created.
+
+        Shared clients are left open for the other models using them.
+        """
+        if self.client is not None:
+            if all(client is not self.client for client in _SHARED_CLIENTS.values()):
+                self.client.close()
+            self.client = None
+
+    async def aclose(self) -> None:
+        """
+        Close the asynchronous HTTP client, if one was created.
+
+        Shared clients and a shared `async_transport` are left open for their other users.
+        """
+        if self.async_client is not None:
+            if self.async_transport is None and all(
+                client is not self.async_client for client in _SHARED_ASYNC_CLIENTS.values()
+            ):
+                await self.async_client.aclose()
+            self.async_client = None
+
     @property
     def request_kwargs(self) -> Dict[str, Any]:
         """
         Returns keyword arguments for model API requests.
 
+        The dictionary is built once and cached until a request parameter changes;
+        callers must copy it before adding request-specific keys.
+
+        Returns:
+            Dict[str, Any]: A dictionary of keyword arguments for API requests.
+        """
+        if self._cached_request_kwargs is None:
+            self._cached_request_kwargs = self._build_request_kwargs()
+        return self._cached_request_kwargs
+
+    @property
+    def stream_request_kwargs(self) -> Dict[str, Any]:
+        """
+        Returns keyword arguments for streaming model API requests.
+
+        Same as `request_kwargs` with `"stream": True`, cached the same way.
+
+        Returns:
+            Dict[str, Any]: A dictionary of keyword arguments for streaming API requests.
+        """
+        if self._cached_stream_kwargs is None:
+            self._cached_stream_kwargs = {**self.request_kwargs, "stream": True}
+        return self._cached_stream_kwargs
+
+    def _build_request_kwargs(self) -> Dict[str, Any]:
+        """
+        Build keyword arguments for model API requests from the current parameters.
+
         Returns:
             Dict[str, Any]: A dictionary of keyword arguments for API requests.
         """
@@ -200,24 +469,22 @@ class Formation(Model):
             Dict[str, Any]: The dictionary representation of the model.
         """
         _dict = super().to_dict()
-        _dict.update(
-            {
-                "temperature": self.temperature,
-                "max_tokens": self.max_tokens,
-                "top_p": self.top_p,
-                "stop": self.stop,
-                "frequency_penalty": self.frequency_penalty,
-                "presence_penalty": self.presence_penalty,
-                "seed": self.seed,
-                "response_format": self.response_format,
-                "tools": self._tools,
-                "tool_choice": self.tool_choice
-                if (self._tools is not None and self.tool_choice is not None)
-                else "auto",
-            }
-        )
-        cleaned_dict = {k: v for k, v in _dict.items() if v is not None}
-        return cleaned_dict
+        if _dict.get("tool_call_limit", 0) is None:
+            del _dict["tool_call_limit"]
+
+        if self._cached_to_dict is None:
+            _params: Dict[str, Any] = {}
+            for key in _TO_DICT_FIELDS:
+                value = getattr(self, key)
+                if value is not None:
+                    _params[key] = value
+            if self._tools is not None:
+                _params["tools"] = self._tools
+            _params["tool_choice"] = self.tool_choice if (self._tools is not None and self.tool_choice is not None) else "auto"
+            self._cached_to_dict = _params
+
+        _dict.update(self._cached_to_dict)
+        return _dict
 
     def _format_message(self, message: Message) -> Dict[str, Any]:
         """
@@ -229,21 +496,70 @@ class Formation(Model):
         Returns:
             Dict[str, Any]: The formatted message.
         """
-        message_dict = {
+        content = message.content
+        message_dict: Dict[str, Any] = {
             "role": message.role,
-            "content": message.content if message.content is not None else "",
-            "name": message.name or message.tool_name,
-            "tool_call_id": message.tool_call_id,
-            "tool_calls": message.tool_calls,
+            "content": content if content is not None else "",
         }
 
-        message_dict = {k: v for k, v in message_dict.items() if v is not None}
+        name = message.name or message.tool_name
+        if name is not None:
+            message_dict["name"] = name
 
-        if message.tool_calls is None or len(message.tool_calls) == 0:
-            message_dict["tool_calls"] = None
+        tool_call_id = message.tool_call_id
+        if tool_call_id is not None:
+            message_dict["tool_call_id"] = tool_call_id
+
+        tool_calls = message.tool_calls
+        message_dict["tool_calls"] = tool_calls if tool_calls else None
 
         return message_dict
 
+    def _format_messages(self, messages: List[Message]) -> List[Dict[str, Any]]:
+        """
+        Format a list of messages for the Formation Cloud API.
+
+        Args:
+            messages (List[Message]): The messages to format.
+
+        Returns:
+            List[Dict[str, Any]]: The formatted messages.
+        """
+        format_message = self._format_message
+        return [format_message(m) for m in messages]
+
+    def _encode_request(self, request_kwargs: Dict[str, Any], messages: List[Message]) -> bytes:
+        """
+        Encode a chat completion request body.
+
+        Args:
+            request_kwargs (Dict[str, Any]): The cached request kwargs to send.
+            messages (List[Message]): The messages to send to the model.
+
+        Returns:
+            bytes: The JSON request body.
+        """
+        request_data = request_kwargs.copy()
+        request_data["messages"] = self._format_messages(messages)
+        return orjson.dumps(request_data)
+
+    @contextmanager
+    def _provider_errors(self) -> Iterator[None]:
+        """
+        Log errors raised while invoking the model and re-raise them as ModelProviderError.
+        """
+        try:
+            yield
+        except httpx.HTTPStatusError as e:
+            log_error(f"HTTP error invoking Formation model: {e}")
+            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
+        except httpx.TimeoutException as e:
+            log_error(f"Timeout invoking Formation model: {e}")
+            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
+        except Exception as e:
+            log_error(f"Unexpected error invoking Formation model: {e}")
+            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
+
     def invoke(self, messages: List[Message]) -> Dict[str, Any]:
         """
         Send a chat completion request to the Formation Cloud API.
@@ -254,30 +570,18 @@ class Formation(Model):
         Returns:
             Dict[str, Any]: The chat completion response.
         """
-        try:
+        with self._provider_errors():
             client = self.get_client()
             
-            request_data = {
-                **self.request_kwargs,
-                "messages": [self._format_message(m) for m in messages],
-            }
-            
+            body = self._encode_request(self.request_kwargs, messages)
+
             response = client.post(
-                "/chat/completions",
-                json=request_data,
+                _CHAT_COMPLETIONS_PATH,
+                content=body,
             )
             
             response.raise_for_status()
             return response.json()
-        except httpx.HTTPStatusError as e:
-            log_error(f"HTTP error invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
-        except httpx.TimeoutException as e:
-            log_error(f"Timeout invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
-        except Exception as e:
-            log_error(f"Unexpected error invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
 
     async def ainvoke(self, messages: List[Message]) -> Dict[str, Any]:
         """
@@ -289,30 +593,18 @@ class Formation(Model):
         Returns:
             Dict[str, Any]: The chat completion response.
         """
-        try:
+        with self._provider_errors():
             client = self.get_async_client()
             
-            request_data = {
-                **self.request_kwargs,
-                "messages": [self._format_message(m) for m in messages],
-            }
-            
+            body = self._encode_request(self.request_kwargs, messages)
+
             response = await client.post(
-                "/chat/completions",
-                json=request_data,
+                _CHAT_COMPLETIONS_PATH,
+                content=body,
             )
             
             response.raise_for_status()
             return response.json()
-        except httpx.HTTPStatusError as e:
-            log_error(f"HTTP error invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
-        except httpx.TimeoutException as e:
-            log_error(f"Timeout invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
-        except Exception as e:
-            log_error(f"Unexpected error invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
 
     def invoke_stream(self, messages: List[Message]) -> Iterator[Dict[str, Any]]:
         """
@@ -324,43 +616,30 @@ class Formation(Model):
         Returns:
             Iterator[Dict[str, Any]]: An iterator of chat completion chunks.
         """
-        try:
+        with self._provider_errors():
             client = self.get_client()
             
-            request_data = {
-                **self.request_kwargs,
-                "messages": [self._format_message(m) for m in messages],
-                "stream": True,
-            }
-            
-            with client.stream(
-                "POST",
-                "/chat/completions",
-                json=request_data,
-            ) as response:
+            body = self._encode_request(self.stream_request_kwargs, messages)
+
+            request = client.build_request("POST", _CHAT_COMPLETIONS_PATH, content=body)
+            response = client.send(request, stream=True)
+            try:
                 response.raise_for_status()
-                
+
                 for line in response.iter_lines():
-                    if line.startswith("data:"):
-                        data_str = line[5:].strip()
-                        
-                        if data_str == "[DONE]":
-                            break
-                            
-                        try:
-                            data = json.loads(data_str)
-                            yield data
-                        except json.JSONDecodeError:
-                            log_error(f"Error decoding Formation streaming response: {data_str}")
-        except httpx.HTTPStatusError as e:
-            log_error(f"HTTP error invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
-        except httpx.TimeoutException as e:
-            log_error(f"Timeout invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
-        except Exception as e:
-            log_error(f"Unexpected error invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
+                    if line[:5] != _DATA_PREFIX:
+                        continue
+                    data_str = line[6:] if line[5:6] == " " else line[5:]
+
+                    if data_str == "[DONE]":
+                        break
+
+                    try:
+                        yield orjson.loads(data_str)
+                    except orjson.JSONDecodeError:
+                        log_error(f"Error decoding Formation streaming response: {data_str}")
+            finally:
+                response.close()
 
     async def ainvoke_stream(self, messages: List[Message]) -> AsyncIterator[Dict[str, Any]]:
         """
@@ -372,43 +651,30 @@ class Formation(Model):
         Returns:
             AsyncIterator[Dict[str, Any]]: An asynchronous iterator of chat completion chunks.
         """
-        try:
+        with self._provider_errors():
             client = self.get_async_client()
             
-            request_data = {
-                **self.request_kwargs,
-                "messages": [self._format_message(m) for m in messages],
-                "stream": True,
-            }
-            
-            async with client.stream(
-                "POST",
-                "/chat/completions",
-                json=request_data,
-            ) as response:
+            body = self._encode_request(self.stream_request_kwargs, messages)
+
+            request = client.build_request("POST", _CHAT_COMPLETIONS_PATH, content=body)
+            response = await client.send(request, stream=True)
+            try:
                 response.raise_for_status()
-                
+
                 async for line in response.aiter_lines():
-                    if line.startswith("data:"):
-                        data_str = line[5:].strip()
-                        
-                        if data_str == "[DONE]":
-                            break
-                            
-                        try:
-                            data = json.loads(data_str)
-                            yield data
-                        except json.JSONDecodeError:
-                            log_error(f"Error decoding Formation streaming response: {data_str}")
-        except httpx.HTTPStatusError as e:
-            log_error(f"HTTP error invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
-        except httpx.TimeoutException as e:
-            log_error(f"Timeout invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
-        except Exception as e:
-            log_error(f"Unexpected error invoking Formation model: {e}")
-            raise ModelProviderError(message=str(e), model_name=self.name, model_id=self.id) from e
+                    if line[:5] != _DATA_PREFIX:
+                        continue
+                    data_str = line[6:] if line[5:6] == " " else line[5:]
+
+                    if data_str == "[DONE]":
+                        break
+
+                    try:
+                        yield orjson.loads(data_str)
+                    except orjson.JSONDecodeError:
+                        log_error(f"Error decoding Formation streaming response: {data_str}")
+            finally:
+                await response.aclose()
 
     @staticmethod
     def parse_tool_calls(tool_calls_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -421,40 +687,37 @@ class Formation(Model):
         Returns:
             List[Dict[str, Any]]: The built tool calls.
         """
-        tool_calls: List[Dict[str, Any]] = []
-        
+        # Accumulate by index so each chunk is a dict lookup instead of a list resize
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+
         for tool_call in tool_calls_data:
             index = tool_call.get("index", 0)
-            tool_call_id = tool_call.get("id")
-            tool_call_type = tool_call.get("type", "function")
-            
-            function_data = tool_call.get("function", {})
-            function_name = function_data.get("name", "")
-            function_arguments = function_data.get("arguments", "")
-            
-            if len(tool_calls) <= index:
-                tool_calls.extend([{}] * (index - len(tool_calls) + 1))
-                
-            tool_call_entry = tool_calls[index]
-            
-            if not tool_call_entry:
-                tool_call_entry["id"] = tool_call_id
-                tool_call_entry["type"] = tool_call_type
-                tool_call_entry["function"] = {
-                    "name": function_name,
-                    "arguments": function_arguments,
+            function_data = tool_call.get("function") or {}
+            tool_call_entry = tool_calls.get(index)
+
+            if tool_call_entry is None:
+                tool_calls[index] = {
+                    "id": tool_call.get("id"),
+                    "type": tool_call.get("type", "function"),
+                    "function": {
+                        "name": function_data.get("name", ""),
+                        "arguments": function_data.get("arguments", ""),
+                    },
                 }
-            else:
-                if function_name:
-                    tool_call_entry["function"]["name"] += function_name
-                if function_arguments:
-                    tool_call_entry["function"]["arguments"] += function_arguments
-                if tool_call_id:
-                    tool_call_entry["id"] = tool_call_id
-                if tool_call_type:
-                    tool_call_entry["type"] = tool_call_type
-                    
-        return tool_calls
+                continue
+
+            entry_function = tool_call_entry["function"]
+            function_name = function_data.get("name")
+            if function_name:
+                entry_function["name"] += function_name
+            function_arguments = function_data.get("arguments")
+            if function_arguments:
+                entry_function["arguments"] += function_arguments
+
+            tool_call_entry["id"] = tool_call.get("id") or tool_call_entry["id"]
+            tool_call_entry["type"] = tool_call.get("type") or tool_call_entry["type"]
+
+        return [tool_calls[index] for index in sorted(tool_calls)]
 
     def parse_provider_response(self, response: Dict[str, Any]) -> ModelResponse:
         """
@@ -467,27 +730,30 @@ class Formation(Model):
             ModelResponse: A structured model response object.
         """
         model_response = ModelResponse()
-        
-        if "choices" in response and len(response["choices"]) > 0:
-            response_message = response["choices"][0].get("message", {})
-            
+
+        choices = response.get("choices")
+        if choices:
+            response_message = choices[0].get("message") or {}
+
             model_response.role = response_message.get("role")
-            
-            if "content" in response_message and response_message["content"] is not None:
-                model_response.content = response_message["content"]
-                
-            if "tool_calls" in response_message and response_message["tool_calls"] is not None:
-                tool_calls = response_message["tool_calls"]
+
+            content = response_message.get("content")
+            if content is not None:
+                model_response.content = content
+
+            tool_calls = response_message.get("tool_calls")
+            if tool_calls is not None:
                 model_response.tool_calls = tool_calls
-                
+
                 # Ensure tool call arguments are strings, not dictionaries
-                for tool_call in model_response.tool_calls:
-                    if isinstance(tool_call.get("function", {}).get("arguments"), dict):
-                        tool_call["function"]["arguments"] = json.dumps(tool_call["function"]["arguments"])
-        
+                for tool_call in tool_calls:
+                    function_data = tool_call.get("function")
+                    if function_data and isinstance(function_data.get("arguments"), dict):
+                        function_data["arguments"] = json.dumps(function_data["arguments"])
+
         if "usage" in response:
             model_response.response_usage = response["usage"]
-            
+
         return model_response
 
     def parse_provider_response_delta(self, response_delta: Dict[str, Any]) -> ModelResponse:
@@ -501,21 +767,24 @@ class Formation(Model):
             ModelResponse: A structured model response object.
         """
         model_response = ModelResponse()
-        
-        if "choices" in response_delta and len(response_delta["choices"]) > 0:
-            delta = response_delta["choices"][0].get("delta", {})
-            
+
+        choices = response_delta.get("choices")
+        if choices:
+            delta = choices[0].get("delta") or {}
+
             model_response.role = delta.get("role")
-            
-            if "content" in delta and delta["content"] is not None:
-                model_response.content = delta["content"]
-                
-            if "tool_calls" in delta and delta["tool_calls"] is not None:
-                model_response.tool_calls = delta["tool_calls"]
-                
+
+            content = delta.get("content")
+            if content is not None:
+                model_response.content = content
+
+            tool_calls = delta.get("tool_calls")
+            if tool_calls is not None:
+                model_response.tool_calls = tool_calls
+
         if "usage" in response_delta:
             model_response.response_usage = response_delta["usage"]
-            
+
         return model_response
 
 
@@ -525,40 +794,14 @@ class FormationChat(Formation):
     Formation Chat model for agno.
     
     Specialized for chat-based interactions with Formation models.
+
+    Attributes:
+        temperature (Optional[float]): Controls randomness in the model's output. Default is 0.7.
     """
-    
-    def __init__(
-        self,
-        id: str = "best-quality",
-        api_key: Optional[str] = None,
-        base_url: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: Optional[int] = None,
-        top_p: Optional[float] = None,
-        **kwargs,
-    ):
-        """
-        Initialize the Formation Chat model.
-        
-        Args:
-            id: Model ID to use or "best-x" for Formation routing
-            api_key: API key for Formation Cloud
-            base_url: Base URL for Formation Cloud API
-            temperature: Temperature for the model
-            max_tokens: Maximum tokens to generate
-            top_p: Top-p value for sampling
-            **kwargs: Additional parameters to pass to the API
-        """
-        super().__init__(
-            id=id,
-            api_key=api_key,
-            base_url=base_url,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            top_p=top_p,
-            **kwargs,
-        )
-    
+
+    # Chat defaults
+    temperature: Optional[float] = 0.7
+
     def get_metadata(self) -> Dict[str, Any]:
         """
         Get metadata about the model.
@@ -5,8 +5,6 @@ Local development script for Theo-AI.
 This script starts the API server for local testing and development.
 """
 import os
-import subprocess
-import sys
 import time
 from pathlib import Path
 
@@ -29,7 +27,8 @@ def start_api_server():
     # Start the API server
     try:
         print("Starting Theo-AI API server...")
-        subprocess.run([sys.executable, "-m", "api.main"], check=True)
+        from api.main import main as run_api_server
+        run_api_server()
     except KeyboardInterrupt:
         print("\nAPI server stopped by user")
     except Exception as e:
@@ -5,10 +5,10 @@ Run the Theo-AI Telegram bot.
 This script starts the Telegram bot for local testing and development.
 """
 import os
-import subprocess
-import sys
 from pathlib import Path
 
+from dotenv import load_dotenv
+
 def check_env_file():
     """
     Check if .env file exists and contains required variables.
@@ -18,11 +18,11 @@ def check_env_file():
         return False
     
     # Check for TELEGRAM_BOT_TOKEN
-    with open(".env", "r") as f:
-        content = f.read()
-        if "TELEGRAM_BOT_TOKEN=" not in content or "your_telegram_bot_token_here" in content:
-            print("Error: TELEGRAM_BOT_TOKEN not properly configured in .env file")
-            return False
+    load_dotenv()
+    token = os.environ.get("TELEGRAM_BOT_TOKEN", "")
+    if not token or token == "your_telegram_bot_token_here":
+        print("Error: TELEGRAM_BOT_TOKEN not properly configured in .env file")
+        return False
     
     return True
 
@@ -36,7 +36,8 @@ def start_telegram_bot():
     # Start the Telegram bot
     try:
         print("Starting Theo-AI Telegram bot...")
-        subprocess.run([sys.executable, "-m", "telegram.bot"], check=True)
+        from telegram.bot import main as run_bot
+        run_bot()
     except KeyboardInterrupt:
         print("\nTelegram bot stopped by user")
     except Exception as e:
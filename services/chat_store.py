@@ -0,0 +1,141 @@
+"""
+Persistent chat state for the Theo-AI Telegram bot.
+
+Chat contexts and per-chat model settings are stored in SQLite so they
+survive restarts; the bot keeps the chats it is serving cached in memory
+and writes changes through to the store.
+"""
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import aiosqlite
+
+from utils.logging_utils import setup_logger
+
+# Configure logging
+logger = setup_logger("chat_store", "chat_store.log")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    party TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_chat_id ON messages (chat_id, id DESC);
+CREATE TABLE IF NOT EXISTS settings (
+    chat_id TEXT PRIMARY KEY,
+    model_provider TEXT NOT NULL,
+    model_id TEXT NOT NULL
+);
+"""
+
+class ChatStore:
+    """
+    SQLite-backed store for chat messages and chat settings.
+    """
+
+    def __init__(self, path: str, max_context_length: int):
+        """
+        Initialize the store.
+
+        Args:
+            path: Path to the SQLite database file.
+            max_context_length: Number of messages kept per chat.
+        """
+        self.path = path
+        self.max_context_length = max_context_length
+        self._db: Optional[aiosqlite.Connection] = None
+
+    async def open(self) -> None:
+        """
+        Open the database and create the tables if needed.
+        """
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = await aiosqlite.connect(self.path)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.executescript(_SCHEMA)
+        await self._db.commit()
+        logger.info("Opened chat store at %s", self.path)
+
+    async def close(self) -> None:
+        """
+        Close the database.
+        """
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def get_context(self, chat_id: str) -> List[Dict[str, str]]:
+        """
+        Get the most recent messages of a chat, oldest first.
+
+        Args:
+            chat_id: The chat ID.
+
+        Returns:
+            List of {"party", "message"} dictionaries.
+        """
+        async with self._db.execute(
+            "SELECT party, message FROM messages WHERE chat_id = ? ORDER BY id DESC LIMIT ?",
+            (chat_id, self.max_context_length)
+        ) as cursor:
+            rows = await cursor.fetchall()
+        return [{"party": party, "message": message} for party, message in reversed(rows)]
+
+    async def append_message(self, chat_id: str, party: str, message: str) -> None:
+        """
+        Store a chat message and drop messages that fell out of the context window.
+
+        Args:
+            chat_id: The chat ID.
+            party: The sender of the message.
+            message: The message text.
+        """
+        await self._db.execute(
+            "INSERT INTO messages (chat_id, ts, party, message) VALUES (?, ?, ?, ?)",
+            (chat_id, int(time.time()), party, message)
+        )
+        await self._db.execute(
+            "DELETE FROM messages WHERE chat_id = ? AND id NOT IN "
+            "(SELECT id FROM messages WHERE chat_id = ? ORDER BY id DESC LIMIT ?)",
+            (chat_id, chat_id, self.max_context_length)
+        )
+        await self._db.commit()
+
+    async def get_settings(self, chat_id: str) -> Optional[Dict[str, str]]:
+        """
+        Get the model settings of a chat.
+
+        Args:
+            chat_id: The chat ID.
+
+        Returns:
+            The chat settings, or None if the chat has none stored.
+        """
+        async with self._db.execute(
+            "SELECT model_provider, model_id FROM settings WHERE chat_id = ?",
+            (chat_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        return {"model_provider": row[0], "model_id": row[1]}
+
+    async def save_settings(self, chat_id: str, settings: Dict[str, str]) -> None:
+        """
+        Store the model settings of a chat.
+
+        Args:
+            chat_id: The chat ID.
+            settings: Dictionary with "model_provider" and "model_id".
+        """
+        await self._db.execute(
+            "INSERT INTO settings (chat_id, model_provider, model_id) VALUES (?, ?, ?) "
+            "ON CONFLICT(chat_id) DO UPDATE SET "
+            "model_provider = excluded.model_provider, model_id = excluded.model_id",
+            (chat_id, settings["model_provider"], settings["model_id"])
+        )
+        await self._db.commit()
@@ -6,13 +6,16 @@ It listens to group chat messages and forwards them to the API endpoint.
 """
 import logging
 import os
-import json
-from typing import List, Dict, Any, Optional
+from collections import deque
+from typing import List, Dict, Any, Deque, Optional
 import asyncio
+import time
 import httpx
+import orjson
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, MessageEntity
 from telegram.ext import (
+    AIORateLimiter,
     Application,
     CommandHandler,
     MessageHandler,
@@ -25,16 +28,30 @@ from utils.config import (
     TELEGRAM_BOT_TOKEN, 
     API_SECRET_KEY, 
     DEFAULT_MODEL_PROVIDER,
-    DEFAULT_MODEL_ID
+    DEFAULT_MODEL_ID,
+    CHAT_STORE_PATH
 )
+from services.chat_store import ChatStore
+from utils.cache import LRUDict, TTLCache
 from utils.logging_utils import setup_logger
-from utils.system_prompts import DEFAULT_SYSTEM_PROMPT
+from utils.system_prompts import DEFAULT_SYSTEM_PROMPT, SUMMARY_SYSTEM_PROMPT
 
 # Configure logging
 logger = setup_logger("telegram_bot", "telegram_bot.log")
 
 # Define global variables
 MAX_CONTEXT_LENGTH = 10  # Max number of messages to include in context
+MAX_CACHED_CHATS = 10_000  # Max number of chats whose state is kept in memory
+TYPING_DELAY = 1.0  # Seconds before showing the typing indicator
+TYPING_INTERVAL = 4.5  # Seconds between typing indicator refreshes
+STREAM_EDIT_INTERVAL = 3.0  # Minimum seconds between edits of a streamed reply (~20 per minute per group)
+POLL_TIMEOUT = 25  # Seconds each getUpdates long poll waits for new updates
+RATE_LIMIT_RETRIES = 3  # Times a request is retried after Telegram answers 429
+
+# Pre-encoded "systemPrompt" member for /chat request bodies
+_SYSTEM_PROMPT_FIELD = b'"systemPrompt":' + orjson.dumps(DEFAULT_SYSTEM_PROMPT)
+
+ERROR_REPLY = "I encountered an error while processing your request. Please try again later."
 
 # Get API endpoint from environment or use default
 # In production, this should be set to the Formation Cloud endpoint
@@ -50,11 +67,187 @@ API_BASE_URL = API_ENDPOINT.replace("/chat", "")
 
 logger.info(f"Using API endpoint: {API_ENDPOINT}")
 
-# Store chat contexts
-chat_contexts = {}
+# Model settings for chats that have not chosen a model; copy before modifying
+DEFAULT_SETTINGS = {
+    "model_provider": DEFAULT_MODEL_PROVIDER,
+    "model_id": DEFAULT_MODEL_ID
+}
+
+# The bot's username without the leading "@", set in post_init
+BOT_USERNAME: Optional[str] = None
+
+# Shared HTTP client for API requests, created in post_init and closed in post_shutdown
+HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+# Available models from the API, refreshed at most once a minute
+MODELS_CACHE_TTL = 60.0
+_models_cache = TTLCache(max_size=1, default_ttl=MODELS_CACHE_TTL)
+
+# Persistent store for chat contexts and settings, opened in post_init
+CHAT_STORE = ChatStore(CHAT_STORE_PATH, MAX_CONTEXT_LENGTH)
+
+# Chat contexts and settings loaded from the store, kept in memory for active chats
+chat_contexts: Dict[str, Deque[Dict[str, str]]] = LRUDict(MAX_CACHED_CHATS)
+chat_settings: Dict[str, Dict[str, str]] = LRUDict(MAX_CACHED_CHATS)
+
+# Chats where the bot has been mentioned or replied to; other chats' messages are not kept
+active_chats: Dict[str, bool] = LRUDict(MAX_CACHED_CHATS)
+
+# Per-chat locks serializing API calls; held locks are never evicted
+chat_locks: Dict[str, asyncio.Lock] = LRUDict(MAX_CACHED_CHATS, evictable=lambda lock: not lock.locked())
+
+# Rolling summaries of messages that dropped out of each chat's context
+chat_summaries: Dict[str, str] = LRUDict(MAX_CACHED_CHATS)
+
+# Evicted messages waiting to be folded into the summary, and the task doing it
+_pending_evictions: Dict[str, List[Dict[str, str]]] = {}
+_summary_tasks: Dict[str, asyncio.Task] = {}
+
+# Startup task opening the API connection ahead of the first chat
+_warmup_task: Optional[asyncio.Task] = None
+
+async def get_models() -> Dict[str, Any]:
+    """
+    Get the available models from the API, using the cached list when fresh.
+
+    Returns:
+        The /models response data.
+
+    Raises:
+        httpx.HTTPStatusError: If the API returns an error; errors are not cached.
+    """
+    models_data = _models_cache.get("models")
+    if models_data is None:
+        response = await HTTP_CLIENT.get("/models", timeout=5.0)
+        response.raise_for_status()
+        models_data = orjson.loads(response.content)
+        _models_cache.set("models", models_data)
+    return models_data
+
+async def _warm_api_connection() -> None:
+    """
+    Connect to the API and prefetch the model list, so the first chat
+    request does not pay for DNS, TCP and TLS setup.
+    """
+    try:
+        await get_models()
+    except Exception as e:
+        logger.warning(f"Could not reach the API at startup: {str(e)}")
+
+async def get_chat_context(chat_id: str) -> Deque[Dict[str, str]]:
+    """
+    Get the context of a chat, loading it from the store on first use.
+
+    Args:
+        chat_id: The chat ID
+
+    Returns:
+        The chat's recent messages, oldest first
+    """
+    chat_context = chat_contexts.get(chat_id)
+    if chat_context is None:
+        # setdefault keeps the first result if another handler loaded the chat meanwhile
+        stored = await CHAT_STORE.get_context(chat_id)
+        chat_context = chat_contexts.setdefault(chat_id, deque(stored, maxlen=MAX_CONTEXT_LENGTH))
+    return chat_context
+
+async def add_chat_message(chat_id: str, party: str, message: str) -> None:
+    """
+    Add a message to a chat's context and persist it.
+
+    Args:
+        chat_id: The chat ID
+        party: The sender of the message
+        message: The message text
+    """
+    chat_context = await get_chat_context(chat_id)
+    # The deque drops the oldest message past MAX_CONTEXT_LENGTH; fold it into the summary
+    if len(chat_context) == chat_context.maxlen:
+        _schedule_summary_refresh(chat_id, chat_context[0])
+    chat_context.append({"party": party, "message": message})
+    await CHAT_STORE.append_message(chat_id, party, message)
+
+def _schedule_summary_refresh(chat_id: str, evicted: Dict[str, str]) -> None:
+    """
+    Queue an evicted message for the chat's summary, starting a refresh if none is running.
+
+    Args:
+        chat_id: The chat ID
+        evicted: The message that dropped out of the context
+    """
+    _pending_evictions.setdefault(chat_id, []).append(evicted)
+    if chat_id not in _summary_tasks:
+        _summary_tasks[chat_id] = asyncio.create_task(_refresh_summary(chat_id))
+
+async def _refresh_summary(chat_id: str) -> None:
+    """
+    Fold pending evicted messages into the chat's summary in the background.
+
+    Messages evicted while a refresh is in flight are picked up by the next round.
+
+    Args:
+        chat_id: The chat ID
+    """
+    try:
+        settings = await get_chat_settings(chat_id)
+        while _pending_evictions.get(chat_id):
+            evicted = _pending_evictions.pop(chat_id)
+            summary_context = evicted
+            if chat_id in chat_summaries:
+                summary_context = [{"party": "Current summary", "message": chat_summaries[chat_id]}] + evicted
+            
+            response = await HTTP_CLIENT.post("/chat", content=orjson.dumps({
+                "chatContext": summary_context,
+                "systemPrompt": SUMMARY_SYSTEM_PROMPT,
+                "modelProvider": settings["model_provider"],
+                "modelId": settings["model_id"]
+            }))
+            response.raise_for_status()
+            summary = orjson.loads(response.content).get("response", "")
+            # /chat answers agent failures with the generic error reply: keep the old
+            # summary and requeue the messages for the next refresh
+            if not summary or summary == ERROR_REPLY:
+                logger.warning(f"Summary refresh failed for chat {chat_id}, keeping the previous summary")
+                _pending_evictions[chat_id] = evicted + _pending_evictions.get(chat_id, [])
+                break
+            chat_summaries[chat_id] = summary
+    except Exception as e:
+        logger.error(f"Error refreshing summary for chat {chat_id}: {str(e)}")
+    finally:
+        _summary_tasks.pop(chat_id, None)
+
+def _build_chat_context(chat_id: str, chat_context: Deque[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Build the chat context for an API request, led by the summary of older messages.
+
+    Args:
+        chat_id: The chat ID
+        chat_context: The chat's recent messages
 
-# Store chat settings
-chat_settings = {}
+    Returns:
+        The chat context to send
+    """
+    summary = chat_summaries.get(chat_id)
+    if summary:
+        return [{"party": "Summary of earlier conversation", "message": summary}, *chat_context]
+    return list(chat_context)
+
+async def get_chat_settings(chat_id: str) -> Dict[str, str]:
+    """
+    Get the model settings of a chat, loading them from the store on first use.
+
+    Args:
+        chat_id: The chat ID
+
+    Returns:
+        The chat settings; changes must be saved with CHAT_STORE.save_settings
+    """
+    settings = chat_settings.get(chat_id)
+    if settings is None:
+        # setdefault keeps the first result if another handler loaded the chat meanwhile
+        stored = await CHAT_STORE.get_settings(chat_id)
+        settings = chat_settings.setdefault(chat_id, stored or dict(DEFAULT_SETTINGS))
+    return settings
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
@@ -92,31 +285,83 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     chat_id = str(update.effective_chat.id)
     
     # Get current model settings
-    settings = chat_settings.get(chat_id, {})
-    model_provider = settings.get("model_provider", DEFAULT_MODEL_PROVIDER)
-    model_id = settings.get("model_id", DEFAULT_MODEL_ID)
+    settings = await get_chat_settings(chat_id)
+    model_provider = settings["model_provider"]
+    model_id = settings["model_id"]
     
     # Test API connection
     status_message = f"API Endpoint: {API_ENDPOINT}\n"
     status_message += f"Current Model: {model_provider}/{model_id}\n\n"
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{API_BASE_URL}/health",
-                headers={"X-API-Key": API_SECRET_KEY},
-                timeout=5.0
-            )
-            
-            if response.status_code == 200:
-                status_message += "✅ API is online and responding"
-            else:
-                status_message += f"❌ API returned status code: {response.status_code}"
+        response = await HTTP_CLIENT.get("/health", timeout=5.0)
+        
+        if response.status_code == 200:
+            status_message += "✅ API is online and responding"
+        else:
+            status_message += f"❌ API returned status code: {response.status_code}"
     except Exception as e:
         status_message += f"❌ Cannot connect to API: {str(e)}"
     
     await update.message.reply_text(status_message)
 
+def _build_model_keyboard(
+    models_data: Dict[str, Any],
+    current_provider: str,
+    current_model: str
+) -> InlineKeyboardMarkup:
+    """
+    Build the provider and model selection keyboard.
+
+    Args:
+        models_data: The /models response data
+        current_provider: The chat's current model provider
+        current_model: The chat's current model ID
+
+    Returns:
+        The inline keyboard markup
+    """
+    keyboard = []
+    
+    # First, add provider buttons
+    provider_row = []
+    for provider in models_data.get("providers", []):
+        provider_id = provider.get("id")
+        provider_name = provider.get("name")
+        
+        # Mark current provider
+        if provider_id == current_provider:
+            provider_name = f"✓ {provider_name}"
+            
+        provider_row.append(
+            InlineKeyboardButton(
+                provider_name,
+                callback_data=f"provider:{provider_id}"
+            )
+        )
+        
+    keyboard.append(provider_row)
+    
+    # Add model buttons for current provider
+    for provider in models_data.get("providers", []):
+        if provider.get("id") == current_provider:
+            for model in provider.get("models", []):
+                model_id = model.get("id")
+                model_name = model.get("name")
+                
+                # Mark current model
+                if model_id == current_model:
+                    model_name = f"✓ {model_name}"
+                    
+                keyboard.append([
+                    InlineKeyboardButton(
+                        model_name,
+                        callback_data=f"model:{model_id}"
+                    )
+                ])
+    
+    return InlineKeyboardMarkup(keyboard)
+
 async def model_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Handle the /model command - allows selecting the AI model.
@@ -124,69 +369,21 @@ async def model_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     chat_id = str(update.effective_chat.id)
     
     # Get current model settings
-    settings = chat_settings.get(chat_id, {})
-    current_provider = settings.get("model_provider", DEFAULT_MODEL_PROVIDER)
-    current_model = settings.get("model_id", DEFAULT_MODEL_ID)
+    settings = await get_chat_settings(chat_id)
+    current_provider = settings["model_provider"]
+    current_model = settings["model_id"]
     
     try:
         # Get available models
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{API_BASE_URL}/models",
-                headers={"X-API-Key": API_SECRET_KEY},
-                timeout=5.0
+        try:
+            models_data = await get_models()
+        except httpx.HTTPStatusError as e:
+            await update.message.reply_text(
+                f"❌ Error fetching available models. Status code: {e.response.status_code}"
             )
+            return
             
-            if response.status_code != 200:
-                await update.message.reply_text(
-                    f"❌ Error fetching available models. Status code: {response.status_code}"
-                )
-                return
-                
-            models_data = response.json()
-            
-        # Create model selection keyboard
-        keyboard = []
-        
-        # First, add provider buttons
-        provider_row = []
-        for provider in models_data.get("providers", []):
-            provider_id = provider.get("id")
-            provider_name = provider.get("name")
-            
-            # Mark current provider
-            if provider_id == current_provider:
-                provider_name = f"✓ {provider_name}"
-                
-            provider_row.append(
-                InlineKeyboardButton(
-                    provider_name,
-                    callback_data=f"provider:{provider_id}"
-                )
-            )
-            
-        keyboard.append(provider_row)
-        
-        # Add model buttons for current provider
-        for provider in models_data.get("providers", []):
-            if provider.get("id") == current_provider:
-                for model in provider.get("models", []):
-                    model_id = model.get("id")
-                    model_name = model.get("name")
-                    
-                    # Mark current model
-                    if model_id == current_model:
-                        model_name = f"✓ {model_name}"
-                        
-                    keyboard.append([
-                        InlineKeyboardButton(
-                            model_name,
-                            callback_data=f"model:{model_id}"
-                        )
-                    ])
-        
-        # Create inline keyboard markup
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = _build_model_keyboard(models_data, current_provider, current_model)
         
         await update.message.reply_text(
             f"Current model: {current_provider}/{current_model}\n\n"
@@ -209,35 +406,146 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     chat_id = str(query.message.chat_id)
     
-    # Initialize settings for this chat if not exists
-    if chat_id not in chat_settings:
-        chat_settings[chat_id] = {
-            "model_provider": DEFAULT_MODEL_PROVIDER,
-            "model_id": DEFAULT_MODEL_ID
-        }
+    # Get settings for this chat
+    settings = await get_chat_settings(chat_id)
     
     callback_data = query.data
     
     if callback_data.startswith("provider:"):
         # Handle provider selection
         provider = callback_data.split(":", 1)[1]
-        chat_settings[chat_id]["model_provider"] = provider
+        settings["model_provider"] = provider
+        await CHAT_STORE.save_settings(chat_id, settings)
+        
+        # Update the keyboard in place to show the new selection
+        current_model = settings["model_id"]
+        try:
+            models_data = await get_models()
+        except Exception as e:
+            logger.error(f"Error fetching models for provider selection: {str(e)}")
+            await query.edit_message_text(f"❌ Error fetching available models: {str(e)}")
+            return
         
-        # Update the message to show the new selection
-        await model_command(update, context)
-        await query.message.delete()
+        await query.edit_message_text(
+            f"Current model: {provider}/{current_model}\n\n"
+            "Select a provider or model:",
+            reply_markup=_build_model_keyboard(models_data, provider, current_model)
+        )
     
     elif callback_data.startswith("model:"):
         # Handle model selection
         model = callback_data.split(":", 1)[1]
-        chat_settings[chat_id]["model_id"] = model
+        settings["model_id"] = model
+        await CHAT_STORE.save_settings(chat_id, settings)
         
         # Send confirmation message
-        provider = chat_settings[chat_id]["model_provider"]
+        provider = settings["model_provider"]
         await query.message.edit_text(
             f"✅ Model updated to {provider}/{model}"
         )
 
+async def _typing_loop(bot: Any, chat_id: str) -> None:
+    """
+    Keep the typing indicator visible until cancelled.
+
+    Telegram clears the indicator after about 5 seconds, so it is re-sent
+    periodically. The first one is delayed so fast replies skip it entirely.
+
+    Args:
+        bot: The Telegram bot
+        chat_id: The chat ID
+    """
+    await asyncio.sleep(TYPING_DELAY)
+    while True:
+        try:
+            await bot.send_chat_action(chat_id=chat_id, action="typing")
+        except Exception as e:
+            logger.warning(f"Error sending typing action: {str(e)}")
+        await asyncio.sleep(TYPING_INTERVAL)
+
+def _encode_chat_request(fields: Dict[str, Any]) -> bytes:
+    """
+    Encode a /chat request that uses the default system prompt.
+
+    The system prompt is the largest field and never changes, so its JSON is
+    encoded once at import and spliced into each body.
+
+    Args:
+        fields: The other request fields; must not be empty
+
+    Returns:
+        The JSON request body
+    """
+    return b"".join((b"{", _SYSTEM_PROMPT_FIELD, b",", orjson.dumps(fields)[1:]))
+
+async def _stream_reply(message: Any, bot: Any, chat_id: str, api_request: bytes) -> Optional[str]:
+    """
+    Stream the API response into a reply, editing it as text arrives.
+
+    The reply is sent with the first text and then edited at most every
+    STREAM_EDIT_INTERVAL seconds, within Telegram's limit of about 20
+    messages per minute in a group. Errors are reported in the chat.
+
+    Args:
+        message: The Telegram message to reply to
+        bot: The Telegram bot
+        chat_id: The chat ID
+        api_request: The encoded /chat request body
+
+    Returns:
+        The full response text, or None if the request failed
+    """
+    text = ""
+    sent_text = ""
+    reply = None
+    last_edit = 0.0
+    
+    # Show the typing indicator until the first text arrives
+    typing_task = asyncio.create_task(_typing_loop(bot, chat_id))
+    try:
+        async with HTTP_CLIENT.stream("POST", "/chat/stream", content=api_request) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise RuntimeError(f"API returned {response.status_code}: {response.text}")
+            
+            async for line in response.aiter_lines():
+                if line[:6] != "data: ":
+                    continue
+                data = line[6:]
+                if data == "[DONE]":
+                    break
+                
+                event = orjson.loads(data)
+                if "error" in event:
+                    raise RuntimeError(event["error"])
+                text += event.get("delta") or ""
+                if not text.strip():
+                    continue
+                
+                now = time.monotonic()
+                if reply is None:
+                    typing_task.cancel()
+                    reply = await message.reply_text(text)
+                    sent_text, last_edit = text, now
+                elif now - last_edit >= STREAM_EDIT_INTERVAL:
+                    await reply.edit_text(text)
+                    sent_text, last_edit = text, now
+        
+        if not text.strip():
+            raise RuntimeError("API returned an empty response")
+        if text != sent_text:
+            await reply.edit_text(text)
+        return text
+    except Exception as e:
+        logger.error(f"Error from API: {str(e)}")
+        if reply is None:
+            await message.reply_text(ERROR_REPLY)
+        else:
+            await reply.edit_text(ERROR_REPLY)
+        return None
+    finally:
+        typing_task.cancel()
+
 async def process_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Process incoming chat messages and forward them to the AI backend.
@@ -248,94 +556,96 @@ async def process_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     chat_id = str(update.effective_chat.id)
     user = update.effective_user
-    message_text = update.message.text
-    
-    # Initialize chat context if not exists
-    if chat_id not in chat_contexts:
-        chat_contexts[chat_id] = []
-    
-    # Add new message to context
-    chat_contexts[chat_id].append({
-        "party": user.username or f"{user.first_name} {user.last_name}".strip(),
-        "message": message_text
-    })
-    
-    # Limit context length
-    if len(chat_contexts[chat_id]) > MAX_CONTEXT_LENGTH:
-        chat_contexts[chat_id] = chat_contexts[chat_id][-MAX_CONTEXT_LENGTH:]
+    message = update.message
+    message_text = message.text
     
     # Check if the bot is mentioned or if the message is a reply to the bot
-    is_mentioned = bool(update.message.entities and any(
-        entity.type == "mention" and context.bot.username in message_text[entity.offset:entity.offset + entity.length]
-        for entity in update.message.entities
-    ))
+    # parse_entities converts Telegram's UTF-16 offsets; usernames are case-insensitive
+    bot_mention = f"@{BOT_USERNAME}".lower()
+    is_mentioned = bool(message.entities) and any(
+        mention.lower() == bot_mention
+        for mention in message.parse_entities([MessageEntity.MENTION]).values()
+    )
     is_reply_to_bot = bool(
-        update.message.reply_to_message and 
-        update.message.reply_to_message.from_user.id == context.bot.id
+        message.reply_to_message and 
+        message.reply_to_message.from_user.id == context.bot.id
     )
+    should_respond = is_mentioned or is_reply_to_bot
     
-    # Only respond if the bot is mentioned or the message is a reply to the bot
-    if not (is_mentioned or is_reply_to_bot):
+    # Only keep context for chats the bot takes part in
+    if should_respond:
+        active_chats[chat_id] = True
+    elif chat_id not in active_chats:
         return
     
-    # Show typing indicator
-    await context.bot.send_chat_action(chat_id=chat_id, action="typing")
-    
-    try:
-        # Get model settings
-        if chat_id not in chat_settings:
-            chat_settings[chat_id] = {
-                "model_provider": DEFAULT_MODEL_PROVIDER,
-                "model_id": DEFAULT_MODEL_ID
-            }
-        
-        model_provider = chat_settings[chat_id]["model_provider"]
-        model_id = chat_settings[chat_id]["model_id"]
+    # One message per chat at a time, so each reply follows its prompt in the context
+    async with chat_locks.setdefault(chat_id, asyncio.Lock()):
+        # Add new message to context
+        chat_context = await get_chat_context(chat_id)
+        await add_chat_message(
+            chat_id,
+            user.username or f"{user.first_name} {user.last_name}".strip(),
+            message_text
+        )
         
-        # Prepare API request
-        api_request = {
-            "chatContext": chat_contexts[chat_id],
-            "systemPrompt": DEFAULT_SYSTEM_PROMPT,
-            "modelProvider": model_provider,
-            "modelId": model_id,
-            "chatId": chat_id
-        }
+        # Only respond if the bot is mentioned or the message is a reply to the bot
+        if not should_respond:
+            return
         
-        # Call API
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                API_ENDPOINT,
-                json=api_request,
-                headers={"X-API-Key": API_SECRET_KEY},
-                timeout=60.0
-            )
+        try:
+            # Get model settings
+            settings = await get_chat_settings(chat_id)
+            model_provider = settings["model_provider"]
+            model_id = settings["model_id"]
             
-            # Check response
-            if response.status_code != 200:
-                logger.error(f"Error from API: {response.status_code} {response.text}")
-                await update.message.reply_text(
-                    "I encountered an error while processing your request. Please try again later."
-                )
-                return
-            
-            # Parse response
-            response_data = response.json()
-            ai_response = response_data.get("response", "")
-            
-            # Add AI response to context
-            chat_contexts[chat_id].append({
-                "party": "Theo-AI",
-                "message": ai_response
+            # Prepare API request
+            api_request = _encode_chat_request({
+                "chatContext": _build_chat_context(chat_id, chat_context),
+                "modelProvider": model_provider,
+                "modelId": model_id,
+                "chatId": chat_id
             })
             
-            # Send response
-            await update.message.reply_text(ai_response)
+            # Stream the response into the chat as it is generated
+            ai_response = await _stream_reply(message, context.bot, chat_id, api_request)
             
-    except Exception as e:
-        logger.error(f"Error processing message: {str(e)}")
-        await update.message.reply_text(
-            "I encountered an error while processing your request. Please try again later."
-        )
+            # Add AI response to context
+            if ai_response is not None:
+                await add_chat_message(chat_id, "Theo-AI", ai_response)
+                
+        except Exception as e:
+            logger.error(f"Error processing message: {str(e)}")
+            await message.reply_text(ERROR_REPLY)
+
+async def post_init(application: Application) -> None:
+    """
+    Open the chat store and create the shared HTTP client once the application is initialized.
+    """
+    global BOT_USERNAME, HTTP_CLIENT, _warmup_task
+    BOT_USERNAME = application.bot.username
+    await CHAT_STORE.open()
+    HTTP_CLIENT = httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        headers={"X-API-Key": API_SECRET_KEY, "Content-Type": "application/json"},
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0),
+        http2=True
+    )
+    _warmup_task = asyncio.create_task(_warm_api_connection())
+
+async def post_shutdown(application: Application) -> None:
+    """
+    Close the shared HTTP client and the chat store when the application shuts down.
+    """
+    global HTTP_CLIENT
+    if HTTP_CLIENT is not None:
+        if _warmup_task is not None:
+            _warmup_task.cancel()
+        for task in list(_summary_tasks.values()):
+            task.cancel()
+        await HTTP_CLIENT.aclose()
+        HTTP_CLIENT = None
+    await CHAT_STORE.close()
 
 def main() -> None:
     """
@@ -346,8 +656,27 @@ def main() -> None:
         logger.error("TELEGRAM_BOT_TOKEN not found in environment variables")
         return
     
+    # Run on uvloop like the API server; it is not available on Windows
+    try:
+        import uvloop
+    except ImportError:
+        logger.info("uvloop not installed, using the default asyncio event loop")
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     # Create application
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        # Concurrent replies and edits share one multiplexed connection to the Bot API
+        .http_version("2")
+        .concurrent_updates(True)
+        # Queue sends and edits within Telegram's flood limits instead of failing on 429
+        .rate_limiter(AIORateLimiter(max_retries=RATE_LIMIT_RETRIES))
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
     
     # Add handlers
     application.add_handler(CommandHandler("start", start))
@@ -355,11 +684,20 @@ def main() -> None:
     application.add_handler(CommandHandler("status", status_command))
     application.add_handler(CommandHandler("model", model_command))
     application.add_handler(CallbackQueryHandler(button_callback))
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, process_message))
+    # Slow API calls must not hold up other chats; per-chat locks keep each chat in order
+    application.add_handler(MessageHandler(
+        filters.UpdateType.MESSAGE & filters.TEXT & ~filters.COMMAND,
+        process_message,
+        block=False
+    ))
     
     # Start the bot
     logger.info("Starting Theo-AI Telegram bot")
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    # Only ask Telegram for the update types the handlers above consume
+    application.run_polling(
+        timeout=POLL_TIMEOUT,
+        allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY]
+    )
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+Tests for the LRUDict used to bound the Telegram bot's per-chat state.
+"""
+import asyncio
+
+from utils.cache import LRUDict
+
+def test_reads_and_iteration_keep_the_order():
+    d = LRUDict(max_size=3)
+    for key in "abc":
+        d[key] = key.upper()
+
+    # Reading every entry while iterating must not reorder the dictionary
+    assert [d[key] for key in d] == ["A", "B", "C"]
+    assert dict(d) == {"a": "A", "b": "B", "c": "C"}
+    assert list(d) == ["a", "b", "c"]
+
+def test_get_marks_entries_as_recently_used():
+    d = LRUDict(max_size=2)
+    d["a"] = 1
+    d["b"] = 2
+    assert d.get("a") == 1
+
+    d["c"] = 3
+    assert list(d) == ["a", "c"]
+
+def test_copy_keeps_the_bound():
+    d = LRUDict(max_size=2)
+    d["a"] = 1
+    d["b"] = 2
+
+    duplicate = d.copy()
+    duplicate["c"] = 3
+    assert isinstance(duplicate, LRUDict)
+    assert list(duplicate) == ["b", "c"]
+    assert list(d) == ["a", "b"]
+
+def test_held_locks_are_not_evicted():
+    async def scenario():
+        locks = LRUDict(max_size=2, evictable=lambda lock: not lock.locked())
+        held = locks.setdefault("a", asyncio.Lock())
+        async with held:
+            locks.setdefault("b", asyncio.Lock())
+            locks.setdefault("c", asyncio.Lock())
+            # "b" is evicted in place of the older but held "a"
+            assert list(locks) == ["a", "c"]
+            assert locks.setdefault("a", asyncio.Lock()) is held
+
+    asyncio.run(scenario())
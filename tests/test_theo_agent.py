@@ -0,0 +1,93 @@
+"""
+Tests for TheoAgent run state and the agent pool.
+
+Model calls go to an httpx.MockTransport, so no provider API key or network is needed.
+"""
+import asyncio
+import json
+import os
+
+import httpx
+
+# utils.config requires these at import
+os.environ.setdefault("API_SECRET_KEY", "test-secret")
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "123:test")
+os.environ.setdefault("FORMATION_API_KEY", "test-formation-key")
+
+import agents.theoAgent as theo_agent
+from agents.batcher import batcher
+
+CHAT_CONTEXT = [{"party": "alice", "message": "Who is Acme Corp?"}]
+
+def _mock_provider(request: httpx.Request) -> httpx.Response:
+    """
+    Answer chat completion requests, streamed or not, like the Formation API.
+    """
+    body = json.loads(request.content)
+    if body.get("stream"):
+        chunks = [
+            {"choices": [{"index": 0, "delta": {"content": text}}]}
+            for text in ("streamed ", "reply")
+        ]
+        events = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks)
+        return httpx.Response(
+            200,
+            text=events + "data: [DONE]\n\n",
+            headers={"content-type": "text/event-stream"}
+        )
+    return httpx.Response(200, json={
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": body["model"],
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "plain reply"}
+        }],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+    })
+
+def test_chat_after_stream_on_pooled_agent(monkeypatch):
+    monkeypatch.setattr(theo_agent, "_SHARED_TRANSPORT", httpx.MockTransport(_mock_provider))
+    theo_agent._AGENT_CACHE.clear()
+
+    async def run():
+        try:
+            agent = theo_agent.checkout_agent("formation", "best-quality", None)
+            streamed = [
+                delta async for delta in agent.astream_message(CHAT_CONTEXT, "Be brief.")
+            ]
+            response = await agent.aprocess_message(CHAT_CONTEXT, "Be thorough.")
+            theo_agent.release_agent(agent)
+            return agent, "".join(streamed), response
+        finally:
+            await batcher.stop()
+
+    agent, streamed, response = asyncio.run(run())
+    assert theo_agent.checkout_agent("formation", "best-quality", None) is agent
+    assert streamed == "streamed reply"
+    assert response == "plain reply"
+
+def test_concurrent_requests_get_their_own_agents(monkeypatch):
+    monkeypatch.setattr(theo_agent, "_SHARED_TRANSPORT", httpx.MockTransport(_mock_provider))
+    theo_agent._AGENT_CACHE.clear()
+
+    async def request():
+        agent = theo_agent.checkout_agent("formation", "best-quality", "42")
+        try:
+            await agent.aprocess_message(CHAT_CONTEXT, "Be brief.")
+            return agent
+        finally:
+            theo_agent.release_agent(agent)
+
+    async def run():
+        try:
+            return await asyncio.gather(*(request() for _ in range(4)))
+        finally:
+            await batcher.stop()
+
+    agents = asyncio.run(run())
+    assert len({id(agent) for agent in agents}) == 4
+    # All four are pooled for reuse, up to MAX_IDLE_AGENTS
+    assert theo_agent.checkout_agent("formation", "best-quality", "42") in agents
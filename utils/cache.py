@@ -0,0 +1,140 @@
+"""
+Caching utilities for Theo-AI.
+"""
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Bounded in-memory cache whose entries expire after a time-to-live.
+    When the cache is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_size: int = 128, default_ttl: float = 600.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries to keep.
+            default_ttl: Default time-to-live for entries, in seconds.
+        """
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key: The cache key.
+            default: Value to return if the key is missing or expired.
+
+        Returns:
+            The cached value, or the default if not found.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value in the cache.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+            ttl: Optional time-to-live in seconds, overriding the default.
+        """
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove a value from the cache if present.
+
+        Args:
+            key: The cache key.
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Remove all values from the cache.
+        """
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class LRUDict(OrderedDict):
+    """
+    Dictionary holding at most `max_size` entries.
+    Writing an entry, or reading it with `get` or `setdefault`, marks it as
+    recently used; when the dictionary is full, the least recently used entry
+    is evicted. Plain `d[key]` reads and iteration leave the order untouched.
+    """
+
+    def __init__(self, max_size: int = 10_000, evictable: Optional[Callable[[Any], bool]] = None):
+        """
+        Initialize the dictionary.
+
+        Args:
+            max_size: Maximum number of entries to keep.
+            evictable: Optional predicate on values; entries it rejects are never
+                evicted, so the dictionary may grow past `max_size` while they last.
+        """
+        super().__init__()
+        self.max_size = max_size
+        self.evictable = evictable
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        excess = len(self) - self.max_size
+        if excess > 0:
+            self._evict(excess)
+
+    def _evict(self, count: int) -> None:
+        if self.evictable is None:
+            stale = list(islice(self, count))
+        else:
+            stale = list(islice((key for key, value in self.items() if self.evictable(value)), count))
+        for key in stale:
+            del self[key]
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        if key in self:
+            self.move_to_end(key)
+            return super().__getitem__(key)
+        return default
+
+    def setdefault(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        if key in self:
+            return self.get(key)
+        self[key] = default
+        return default
+
+    def copy(self) -> "LRUDict":
+        duplicate = self.__class__(self.max_size, self.evictable)
+        duplicate.update(self)
+        return duplicate
@@ -2,12 +2,19 @@
 Configuration utilities for Theo-AI.
 """
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
-from typing import Optional, Dict, Any
+from typing import Optional, Any, Mapping
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Snapshot of the environment; it does not change during the process lifetime
+_ENV = dict(os.environ)
+
+# Values accepted as true by Config.get_bool
+_TRUE = frozenset({'true', 'yes', '1', 'y'})
+
 class Config:
     """
     Configuration manager for Theo-AI.
@@ -26,7 +33,7 @@ class Config:
         Returns:
             The value of the environment variable, or the default if not found.
         """
-        return os.environ.get(key, default)
+        return _ENV.get(key, default)
     
     @staticmethod
     def get_required(key: str) -> str:
@@ -42,7 +49,7 @@ class Config:
         Raises:
             ValueError: If the environment variable is not found.
         """
-        value = os.environ.get(key)
+        value = _ENV.get(key)
         if value is None:
             raise ValueError(f"Required environment variable '{key}' not found")
         return value
@@ -59,37 +66,34 @@ class Config:
         Returns:
             The value of the environment variable as a boolean.
         """
-        value = os.environ.get(key)
+        value = _ENV.get(key)
         if value is None:
             return default
-        return value.lower() in ('true', 'yes', '1', 'y')
+        return value.lower() in _TRUE
     
     @staticmethod
-    def get_api_keys() -> Dict[str, str]:
+    def get_api_keys() -> Mapping[str, str]:
         """
         Get all API keys defined in environment variables.
         
         Returns:
-            A dictionary of API keys.
+            A read-only mapping of API keys, read once at import.
         """
-        api_keys = {}
-        
-        # OpenAI API key
-        openai_api_key = os.environ.get('OPENAI_API_KEY')
-        if openai_api_key:
-            api_keys['openai'] = openai_api_key
-        
-        # Formation API key
-        formation_api_key = os.environ.get('FORMATION_API_KEY')
-        if formation_api_key:
-            api_keys['formation'] = formation_api_key
-        
-        # Optional third-party API keys
-        crunchbase_api_key = os.environ.get('CRUNCHBASE_API_KEY')
-        if crunchbase_api_key:
-            api_keys['crunchbase'] = crunchbase_api_key
-        
-        return api_keys
+        return _API_KEYS
+
+# Provider name and environment variable of each API key
+_API_KEY_ENV = (
+    ('openai', 'OPENAI_API_KEY'),
+    ('formation', 'FORMATION_API_KEY'),
+    # Optional third-party API keys
+    ('crunchbase', 'CRUNCHBASE_API_KEY'),
+)
+
+_API_KEYS = MappingProxyType({
+    name: value
+    for name, env_var in _API_KEY_ENV
+    if (value := _ENV.get(env_var))
+})
 
 # Constants
 API_SECRET_KEY = Config.get_required('API_SECRET_KEY')
@@ -102,11 +106,24 @@ ENVIRONMENT = Config.get('ENVIRONMENT', 'development')
 DEFAULT_MODEL_PROVIDER = Config.get('DEFAULT_MODEL_PROVIDER', 'formation')
 DEFAULT_MODEL_ID = Config.get('DEFAULT_MODEL_ID', 'best-quality')
 
+# Print agent tool calls in responses (useful for debugging, off in production)
+SHOW_TOOL_CALLS = Config.get_bool('THEO_SHOW_TOOL_CALLS', False)
+
 # API Endpoint for Formation Cloud
 API_ENDPOINT = Config.get('API_ENDPOINT', 'http://localhost:8000')
 if not API_ENDPOINT.endswith('/'):
     API_ENDPOINT += '/'
 
+# Comma-separated origins allowed to call the API from a browser
+CORS_ALLOW_ORIGINS = [
+    origin.strip()
+    for origin in Config.get('CORS_ALLOW_ORIGINS', '*').split(',')
+    if origin.strip()
+]
+
+# SQLite database for the Telegram bot's chat contexts and settings
+CHAT_STORE_PATH = Config.get('CHAT_STORE_PATH', 'data/theo_bot.db')
+
 # Formation API settings
 FORMATION_API_BASE_URL = Config.get('FORMATION_API_BASE_URL', 'https://agents.formation.cloud/v1')
 
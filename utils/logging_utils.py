@@ -1,41 +1,60 @@
 """
 Logging utilities for Theo-AI.
+
+All loggers hand their records to a single queue; one background listener
+thread writes them to the console and the per-logger log files, so logging
+never blocks request handlers on disk I/O.
 """
 import os
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+# Directory holding the per-logger log files
+_LOGS_DIR = Path("logs")
+_LOGS_DIR.mkdir(exist_ok=True)
+
+# Shared queue and background listener for every logger in the process
+_log_queue = queue.SimpleQueue()
+
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
+
+_listener = QueueListener(_log_queue, _console_handler, respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
 def setup_logger(name: str, log_file: str, level=logging.INFO):
     """
-    Set up a logger with file and console handlers.
-    
+    Set up a logger that writes to its log file and the console via the shared queue.
+    Calling it again for a logger that is already set up returns that logger unchanged.
+
     Args:
         name: Name of the logger.
         log_file: Path to the log file.
         level: Logging level.
-        
+
     Returns:
         A configured logger instance.
     """
-    # Ensure the logs directory exists
-    Path("logs").mkdir(exist_ok=True)
-    
-    # Configure logger
+    # Configure logger, once per name
     logger = logging.getLogger(name)
+    if getattr(logger, "_theo_configured", False):
+        return logger
     logger.setLevel(level)
-    
-    # Add file handler
-    file_handler = logging.FileHandler(f"logs/{log_file}")
+
+    # Register a file handler with the listener, only for this logger's records
+    file_handler = RotatingFileHandler(_LOGS_DIR / log_file, maxBytes=10_000_000, backupCount=5)
     file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(file_formatter)
-    
-    # Add console handler
-    console_handler = logging.StreamHandler()
-    console_formatter = logging.Formatter('%(levelname)s - %(message)s')
-    console_handler.setFormatter(console_formatter)
-    
-    # Add handlers to logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
-    return logger 
\ No newline at end of file
+    file_handler.addFilter(logging.Filter(name))
+    _listener.handlers = _listener.handlers + (file_handler,)
+
+    # Hand records to the background listener; the listener already writes to the console
+    logger.addHandler(QueueHandler(_log_queue))
+    logger.propagate = False
+    logger._theo_configured = True
+
+    return logger